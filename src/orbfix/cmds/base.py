@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import functools
 import time
 from typing import List, Optional, Tuple
 
 import serial
+import typer
 
-from ..common.io_utils import hexdump
-from ..transport.serial_rs422 import open_serial, read_frames
+from ..common.config import resolve_port
+from ..common.io_utils import hexdump, parse_one_byte_spec
+from ..transport.serial_rs422 import read_frames, DEFAULT_BAUD, DEFAULT_READ_TIMEOUT_S
+from ..transport.pool import get_serial, discard_serial
 from ..common import RISECommand as RS
 from .parsers import parse_decoded
 
@@ -17,7 +21,24 @@ except Exception:  # pragma: no cover
 
 DEFAULT_OVERALL_WAIT_S = 2.0
 
-__all__ = ["send_and_receive", "DEFAULT_OVERALL_WAIT_S"]
+# Transport options shared by the get/set commands; use as parameter defaults
+PORT_OPTION = typer.Option(None, help="Explicit serial port path")
+BAUD_OPTION = typer.Option(DEFAULT_BAUD, help="Baud rate")
+TIMEOUT_OPTION = typer.Option(DEFAULT_READ_TIMEOUT_S, help="Per-read timeout (s)")
+WAIT_OPTION = typer.Option(DEFAULT_OVERALL_WAIT_S, help="Overall receive window (s)")
+NO_DECODE_OPTION = typer.Option(False, help="Do not decode frames; just dump hex")
+
+__all__ = [
+    "send_and_receive",
+    "run_cmd",
+    "sysid_value",
+    "DEFAULT_OVERALL_WAIT_S",
+    "PORT_OPTION",
+    "BAUD_OPTION",
+    "TIMEOUT_OPTION",
+    "WAIT_OPTION",
+    "NO_DECODE_OPTION",
+]
 
 
 def _encode_frame(cmd_id: int, sysid: int, payload: bytes) -> bytes:
@@ -33,6 +54,12 @@ def _encode_frame(cmd_id: int, sysid: int, payload: bytes) -> bytes:
         return RS.riseprotocol_encode(cmd_id, payload) 
 
 
+@functools.lru_cache(maxsize=8)
+def sysid_value(sysid: Optional[str]) -> int:
+    """Parse a --sysid/--subsys option to its byte value (0 if empty); memoized per spelling."""
+    return parse_one_byte_spec(sysid, what="system id") or 0
+
+
 def send_and_receive(
     port: str,
     baudrate: int,
@@ -54,56 +81,65 @@ def send_and_receive(
     attempt = 0
     frames: List[bytes] = []
 
-    def _open() -> serial.Serial:
+    def _open() -> Tuple[serial.Serial, bool]:
+        """Return (ser, pooled); pooled ports stay open for later commands."""
         if attempt > 0 and reopen_vid_pid and open_serial_by_vidpid:
             vid, pid = reopen_vid_pid
             print(f"[i] Reopening by VID:PID {vid}:{pid} (attempt {attempt}/{retries})...")
-            return open_serial_by_vidpid(vid, pid, baudrate=baudrate, timeout_s=read_timeout_s, wait_s=reopen_wait_s)
-        return open_serial(port, baudrate=baudrate, timeout_s=read_timeout_s)
+            return open_serial_by_vidpid(vid, pid, baudrate=baudrate, timeout_s=read_timeout_s, wait_s=reopen_wait_s), False
+        return get_serial(port, baudrate=baudrate, timeout_s=read_timeout_s), True
 
     while True:
         attempt += 1
+        ser: Optional[serial.Serial] = None
+        pooled = False
         try:
-            with _open() as ser:
-                print(f"Connected to {ser.port} @ {baudrate}")
-
-                # === FLUSH AND DRAIN BEFORE COMMAND ===
-                if pre_flush:
-                    ser.reset_input_buffer()   # Clear OS RX buffer
-                    ser.reset_output_buffer()  # Clear OS TX buffer
-
-                    # Drain any residual data from device
-                    drain_deadline = time.monotonic() + 0.05
-                    drained = bytearray()
-                    while time.monotonic() < drain_deadline:
-                        chunk = ser.read(ser.in_waiting or 1)
-                        if not chunk:
-                            break
-                        drained.extend(chunk)
-
-                    if drained and debug_hex:
-                        print(f"[DRAINED] {len(drained)} bytes: {drained.hex(' ')}")
-
-                # Build TX buffer
-                if encode:
-                    encoded = _encode_frame(cmd_id, sysid, payload)
-                    print(f"Sent (encoded): {hexdump(encoded)} ({len(encoded)} bytes)")
-                else:
-                    encoded = payload
-                    print(f"Sent (raw/no-encode): {hexdump(encoded)} ({len(encoded)} bytes)")
-
-                ser.write(encoded)
-                ser.flush()  # Ensure data is transmitted to device
-
-                deadline = time.monotonic() + overall_wait_s
-                frames = read_frames(
-                    ser,
-                    deadline,
-                    require_eol=require_eol,
-                    debug_hex=debug_hex,
-                )
+            ser, pooled = _open()
+            print(f"Connected to {ser.port} @ {baudrate}")
+
+            # === FLUSH AND DRAIN BEFORE COMMAND ===
+            if pre_flush:
+                ser.reset_input_buffer()   # Clear OS RX buffer
+                ser.reset_output_buffer()  # Clear OS TX buffer
+
+                # Drain any residual data from device
+                drain_deadline = time.monotonic() + 0.05
+                drained = bytearray()
+                while time.monotonic() < drain_deadline:
+                    chunk = ser.read(ser.in_waiting or 1)
+                    if not chunk:
+                        break
+                    drained.extend(chunk)
+
+                if drained and debug_hex:
+                    print(f"[DRAINED] {len(drained)} bytes: {drained.hex(' ')}")
+
+            # Build TX buffer
+            if encode:
+                encoded = _encode_frame(cmd_id, sysid, payload)
+                print(f"Sent (encoded): {hexdump(encoded)} ({len(encoded)} bytes)")
+            else:
+                encoded = payload
+                print(f"Sent (raw/no-encode): {hexdump(encoded)} ({len(encoded)} bytes)")
+
+            ser.write(encoded)
+            ser.flush()  # Ensure data is transmitted to device
+
+            deadline = time.monotonic() + overall_wait_s
+            frames = read_frames(
+                ser,
+                deadline,
+                require_eol=require_eol,
+                debug_hex=debug_hex,
+            )
         except (serial.SerialException, OSError, ValueError) as e:
             print(f"[warn] Serial error: {e}")
+            if pooled:
+                # Drop the broken port so the retry opens a fresh one
+                discard_serial(port, baudrate)
+        finally:
+            if ser is not None and not pooled:
+                ser.close()
 
         if frames:
             break
@@ -145,3 +181,35 @@ def send_and_receive(
 
     return frames
 
+
+
+def run_cmd(
+    cmd_id: int,
+    sysid: int,
+    payload: bytes,
+    *,
+    port: Optional[str],
+    baud: int,
+    timeout: float,
+    wait: float,
+    decode: bool = True,
+) -> List[bytes]:
+    """
+    Shared tail of the get/set commands: resolve the port (explicit or saved)
+    and send one frame, turning serial errors into a CLI exit.
+    """
+    resolved_port = resolve_port(port)
+    try:
+        return send_and_receive(
+            port=resolved_port,
+            baudrate=baud,
+            read_timeout_s=timeout,
+            overall_wait_s=wait,
+            cmd_id=cmd_id,
+            sysid=sysid,
+            payload=payload,
+            decode=decode,
+        )
+    except serial.SerialException as e:
+        typer.secho(f"Serial error: {e}", fg="red")
+        raise typer.Exit(code=1)
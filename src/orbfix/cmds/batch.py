@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+import re
+import shlex
+from pathlib import Path
+from typing import Any, List
+
+import typer
+
+from ..transport.pool import close_all
+
+
+def _entry_argv(entry: Any, defaults: dict) -> List[str]:
+    """
+    Turn one batch entry into a `orbfix cmd` argument list. An entry is either
+    a command line string ("raim-level set --mode on") or a mapping
+    {cmd: "raim-level set", args: {mode: "on"}}; `defaults` are appended as
+    options to every mapping entry that does not set them itself.
+    """
+    if isinstance(entry, str):
+        return shlex.split(entry)
+    if not isinstance(entry, dict) or "cmd" not in entry:
+        raise ValueError(f"expected a string or a mapping with 'cmd', got {entry!r}")
+
+    argv = shlex.split(str(entry["cmd"]))
+    args = {**defaults, **(entry.get("args") or {})}
+    for key, value in args.items():
+        opt = key if key.startswith("-") else f"--{key}"
+        values = value if isinstance(value, list) else [value]
+        for v in values:
+            if v is True:
+                argv.append(opt)
+            elif v is False or v is None:
+                continue
+            else:
+                argv += [opt, str(v)]
+    return argv
+
+
+def _load_yaml(text: str) -> Any:
+    """
+    yaml.safe_load, except that only true/false are booleans: YAML 1.1 also
+    reads on/off/yes/no as booleans, which turns `mode: on` into a bare flag.
+    """
+    import yaml  # only needed here; keeps it off the CLI start-up path
+
+    class _Loader(yaml.SafeLoader):
+        pass
+
+    _Loader.yaml_implicit_resolvers = {
+        first: [(tag, rx) for tag, rx in resolvers if tag != "tag:yaml.org,2002:bool"]
+        for first, resolvers in yaml.SafeLoader.yaml_implicit_resolvers.items()
+    }
+    _Loader.add_implicit_resolver(
+        "tag:yaml.org,2002:bool", re.compile(r"^(?:true|True|TRUE|false|False|FALSE)$"), list("tTfF")
+    )
+    return yaml.load(text, Loader=_Loader)
+
+
+def batch_apply(
+    ctx: typer.Context,
+    file: Path = typer.Argument(..., exists=True, dir_okay=False, help="YAML (or .jsonl, one command per line) file listing the commands to run"),
+    keep_going: bool = typer.Option(False, help="Continue with the next command after a failure"),
+):
+    """
+    Run several commands from one file over a shared serial port.
+
+    All commands run in this one process and reuse the port once it is
+    open. A YAML file is read as below; a .jsonl file holds one entry (JSON
+    string or object) per line instead.
+
+    \b
+    Example:
+      defaults:
+        port: /dev/ttyUSB0
+      commands:
+        - cmd: pvt-mode set
+          args: {mode: rover, feature: [SBAS, DGNSS]}
+        - raim-level set --mode on --port /dev/ttyUSB0
+    """
+    text = file.read_text(encoding="utf-8")
+    if file.suffix.lower() == ".jsonl":
+        try:
+            doc = [json.loads(line) for line in text.splitlines() if line.strip()]
+        except json.JSONDecodeError as e:
+            typer.secho(f"Error: invalid JSON line in {file}: {e}", fg="red")
+            raise typer.Exit(code=1)
+    else:
+        doc = _load_yaml(text) or []
+    if isinstance(doc, dict):
+        defaults = doc.get("defaults") or {}
+        entries = doc.get("commands") or []
+    else:
+        defaults, entries = {}, doc
+    if not isinstance(entries, list):
+        typer.secho("Error: batch file must contain a list of commands", fg="red")
+        raise typer.Exit(code=1)
+
+    # The `cmd` group this command is registered under dispatches each entry
+    group = ctx.parent.command
+    failures = 0
+    try:
+        for idx, entry in enumerate(entries, 1):
+            try:
+                argv = _entry_argv(entry, defaults)
+            except ValueError as e:
+                typer.secho(f"[{idx}/{len(entries)}] Error: {e}", fg="red")
+                failures += 1
+                if not keep_going:
+                    break
+                continue
+
+            typer.secho(f"\n[{idx}/{len(entries)}] {' '.join(argv)}", fg="cyan", bold=True)
+            try:
+                rc = group.main(args=argv, prog_name=ctx.parent.command_path, standalone_mode=False)
+            except Exception as e:
+                typer.secho(f"Error: {e}", fg="red")
+                rc = 1
+            if isinstance(rc, int) and rc != 0:
+                failures += 1
+                if not keep_going:
+                    break
+    finally:
+        close_all()
+
+    if failures:
+        typer.secho(f"\n{failures} command(s) failed", fg="red")
+        raise typer.Exit(code=1)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+from typing import Dict
+
+__all__ = ["COMMAND_MODULES", "load", "load_all"]
+
+# `orbfix cmd <name>` -> module under orbfix.cmds exposing a Typer `app`.
+# Modules are imported on first use, which also registers their response parser.
+COMMAND_MODULES: Dict[str, str] = {
+    "pvt-mode": "x000F_pvt_mode",
+    "version": "x0001_version",
+    "housekeeping": "x0004_housekeeping",
+    "config": "config",
+    "orbfix-gnss-power": "x0002_orbfix_gnss_power",
+    "reset-orbfix-gnss": "x0003_reset_orbfix_gnss",
+    "get-NMEA-output": "x001B_get_NMEA_output",
+    "antenna-offset": "x000C_antenna_offset",
+    "cn0-mask": "x0006_CN0",
+    "elev-mask": "x000D_elevation_mask",
+    "satellite-tracking": "x0007_satellite_tracking",
+    "signal-tracking": "x0008_signal_tracking",
+    "ionosphere-model": "x000E_ionosphere_model",
+    "troposphere-model": "x0016_troposphere_model",
+    "clock-sync-threshold": "x0017_clock_sync_threshold",
+    "sbas-corrections": "x0014_sbas_corrections",
+    "receiver-dynamics": "x0011_receiver_dynamics",
+    "raim-level": "x0010_raim_level",
+    "timing-system": "x0019_timing_system",
+    "signal-usage": "x0015_signal_usage",
+    "smoothing-interval": "x0009_smoothing_interval",
+    "satellite-usage": "x0013_satellite_usage",
+    "notch-filtering": "x000B_notch_filtering",
+    "pps-parameters": "x0018_pps_parameters",
+    "orbfix-cold-restart": "x0020_orbfix_cold_restart",
+    "save-to-boot": "x0021_save_to_boot",
+    "firmware-update": "x0005_firmware_update",
+    "tracking-loop-parameters": "x000A_tracking_loop_parameters",
+    "reset-navigation-filter": "x0012_reset_navigation_filter",
+}
+
+
+def load(name: str) -> ModuleType:
+    """Import (once) and return the module behind `orbfix cmd <name>`."""
+    return importlib.import_module(f"{__package__}.{COMMAND_MODULES[name]}")
+
+
+def load_all() -> None:
+    """Import every command module, e.g. so parse_decoded() knows all responses."""
+    for name in COMMAND_MODULES:
+        load(name)
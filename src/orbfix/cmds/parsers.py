@@ -1,7 +1,21 @@
 from __future__ import annotations
-from typing import Callable, Dict, Optional, Tuple, Any
+from functools import partial
+from struct import Struct
+from typing import Callable, Dict, NamedTuple, Optional, Tuple, Any
+
+from ..common.io_utils import is_printable_ascii
+from ..common.RISECommand import ENCODER_OFFSET
 
 ParseResult = Tuple[str, Optional[dict]]
+
+
+class ParserSpec(NamedTuple):
+    """Fixed-layout response: the payload is unpacked with `struct` and the fields passed to `fmt`."""
+    struct: Struct
+    fmt: Callable[..., ParseResult]
+
+
+# cmd_id -> parser(decoded); filled in at import time by the command modules
 _Registry: Dict[int, Callable[[Any], ParseResult]] = {}
 
 def register(cmd_id: int) -> Callable[[Callable[[Any], ParseResult]], Callable[[Any], ParseResult]]:
@@ -10,15 +24,44 @@ def register(cmd_id: int) -> Callable[[Callable[[Any], ParseResult]], Callable[[
         return fn
     return _wrap
 
+def register_spec(cmd_id: int, spec: ParserSpec) -> ParserSpec:
+    # Bind the spec now so dispatch is the same plain call as for @register parsers
+    _Registry[cmd_id] = partial(_parse_spec, spec)
+    return spec
+
+def short_payload(received: int, expected: int) -> ParseResult:
+    """Common result for a response payload shorter than the command's layout."""
+    return (f"Payload too short: {received} bytes (expected {expected})",
+            {"error": "short_payload", "received_bytes": received})
+
+def _parse_short(payload: bytes, expected: int) -> ParseResult:
+    """Payload shorter than the spec layout: show it as text if printable, else report it as short."""
+    raw = payload.rstrip(b"\x00")
+    if is_printable_ascii(raw):
+        s = raw.decode("ascii")
+        return (f"Received: {s}", {"received": s})
+    return short_payload(len(payload), expected)
+
+def _parse_spec(spec: ParserSpec, decoded: Any) -> ParseResult:
+    frame = getattr(decoded, "frame", None)
+    if frame is not None and decoded.payload_length >= spec.struct.size:
+        # Unpack straight from the received frame, skipping the payload copy
+        return spec.fmt(*spec.struct.unpack_from(frame, ENCODER_OFFSET))
+    payload = getattr(decoded, "payload", b"") or b""
+    if len(payload) < spec.struct.size:
+        return _parse_short(payload, spec.struct.size)
+    return spec.fmt(*spec.struct.unpack_from(payload, 0))
+
 def parse_decoded(decoded: Any) -> ParseResult:
     cmd = getattr(decoded, "cmd_id", None)
-    payload = getattr(decoded, "payload", b"") or b""
     handler = _Registry.get(cmd)
     if handler:
         try:
             return handler(decoded)
         except Exception as e:
+            payload = getattr(decoded, "payload", b"") or b""
             return (f"Parser for 0x{cmd:04X} raised: {e}. Payload hex: {payload.hex()}",
                     {"payload_hex": payload.hex()})
+    payload = getattr(decoded, "payload", b"") or b""
     return (f"No parser for 0x{(cmd if cmd is not None else 0):04X}. Payload hex: {payload.hex()}",
             {"payload_hex": payload.hex()})
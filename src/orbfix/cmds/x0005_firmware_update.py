@@ -8,7 +8,7 @@ import typer
 from ..common.update import send_orbfix_zip
 from ..common.io_utils import parse_one_byte_spec
 from ..common.config import get_default_port
-from ..transport.serial_rs422 import open_serial
+from ..transport.serial_rs422 import open_serial, RISE_MSG_SIZE
 
 DEFAULT_SYSID = "0x6A"
 DEFAULT_BAUD = 115200
@@ -29,9 +29,22 @@ def fw_update(
     sysid: str = typer.Option(DEFAULT_SYSID, "--sysid"),
     port: str | None = typer.Option(None, "--port", help="Explicit serial port path"),
     baud: int = typer.Option(DEFAULT_BAUD, "--baud"),
-    data_size: int = typer.Option(1019, "--data-size", help="Per-packet data bytes (<=1021)"),
+    data_size: int | None = typer.Option(None, "--data-size", hidden=True, help="Deprecated, ignored: use --frame-size"),
     wait: float = typer.Option(2.5, "--wait", help="Response timeout (s)"),
+    frame_size: int = typer.Option(
+        1024, "--frame-size", min=14, max=RISE_MSG_SIZE + 1,
+        help="Encoded bytes per data frame, header and EOL included; 13 of them are framing, "
+             "so 1024 carries 1011 data bytes. The device must accept this size",
+    ),
+    window: int = typer.Option(
+        1, "--window", min=1,
+        help="Data packets kept in flight before waiting for ACKs (1 = stop-and-wait). ACKs carry no packet "
+             "index and are matched in send order; after any NAK or timeout every packet is resent stop-and-wait",
+    ),
 ):
+    if data_size is not None:
+        typer.secho("Warning: --data-size is deprecated and ignored; use --frame-size", fg="yellow")
+
     sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
 
     saved = get_default_port()
@@ -47,7 +60,6 @@ def fw_update(
         "fw_update.log",
         "a",
         encoding="utf-8",
-        buffering=1,
         newline="\n"
     ) as log_file:
         with open_serial(resolved_port, baudrate=baud, timeout_s=0.1) as ser:
@@ -57,6 +69,8 @@ def fw_update(
                 lock,
                 log_file,
                 zip_path,
-                sys_id_val=sys_id_val
+                sys_id_val=sys_id_val,
+                window=window,
+                max_frame=frame_size,
             )
 
@@ -1,23 +1,43 @@
 from __future__ import annotations
+import struct
 import typer
-from ..common.io_utils import parse_one_byte_spec
+from serial import SerialException as _SerialException
 from ..common.io_utils import parse_payload_spec
 from ..transport.serial_rs422 import (
     find_usb_device,
     DEFAULT_BAUD,
     DEFAULT_READ_TIMEOUT_S,
 )
-from .base import send_and_receive, DEFAULT_OVERALL_WAIT_S
-from .parsers import register
+from .base import send_and_receive, DEFAULT_OVERALL_WAIT_S, sysid_value
+from .parsers import ParserSpec, register_spec
+from ..common.config import resolve_port
 
 app = typer.Typer(help="Get or set the Notch filter parameters")
 
 CMD_ID = 0x000B
 DEFAULT_SYSID = "0x6A"
 
+# Mode (U1), CenterFreq (F4), Bandwidth (U2)
+_NOTCH_STRUCT = struct.Struct(">BfH")
 
-@register(CMD_ID)
-def _parse_notch_filtering(decoded):
+# --default_filter: auto mode, 1100.0 MHz, 30 KHz
+_DEFAULT_NOTCH_PAYLOAD = _NOTCH_STRUCT.pack(0, 1100.0, 30)
+
+# modes
+_MODE_MAP = {
+    0: "auto",
+    1: "off",
+    2: "manual",
+}
+
+# Reverse map for name lookup
+_MODE_NAME_TO_INDEX = {name: idx for idx, name in _MODE_MAP.items()}
+
+# Display name for every possible mode byte, unknown values included
+_MODE_DISPLAY = [_MODE_MAP.get(i, f"Mode_{i}") for i in range(256)]
+
+
+def _format_notch_filtering(mode_val, centerfreq_val, bandwidth_val, _display=_MODE_DISPLAY):
     """
     Command 0x000B: Notch filtering (Get/Set)
     Payload:
@@ -28,35 +48,12 @@ def _parse_notch_filtering(decoded):
       - Byte offset 5: U2 - Bandwidth:  30 .. 1600 KHz
     """
 
-    pl: bytes = getattr(decoded, "payload", b"") or b""
-
-    if len(pl) < 7:
-        try:
-            s = pl.rstrip(b"\x00").decode("utf-8")
-            if s and all(31 < ord(ch) < 127 or ch in "\r\n\t ._:-/()" for ch in s):
-                return (f"Received: {s}", {"received": s})
-        except Exception:
-            pass
-
-    import struct
-
-    pl: bytes = getattr(decoded, "payload", b"") or b""
-
-    mode_val = pl[0]  # 1 byte
-    centerfreq_val = struct.unpack(">f", pl[1:5])[0]  # 4-byte float, big-endian
-    bandwidth_val = int.from_bytes(pl[5:7], "big")  # 2 bytes
-
-    # modes
-    mode_map = {
-        0: "auto",
-        1: "off",
-        2: "manual",
-    }
-
-    result = f"Notch filtering:\n"
-    result += f"    Mode:        {mode_val:2d}:{mode_map.get(mode_val, f"Mode_{mode_val}"):12s}\n"
-    result += f"    CenterFreq:   {centerfreq_val:.3f} [Mhz]\n"
-    result += f"    Bandwidth:    {bandwidth_val} [Hz]"
+    result = (
+        f"Notch filtering:\n"
+        f"    Mode:        {mode_val:2d}:{_display[mode_val]:12s}\n"
+        f"    CenterFreq:   {centerfreq_val:.3f} [Mhz]\n"
+        f"    Bandwidth:    {bandwidth_val} [Hz]"
+    )
 
     return (
         result,
@@ -68,6 +65,9 @@ def _parse_notch_filtering(decoded):
     )
 
 
+register_spec(CMD_ID, ParserSpec(_NOTCH_STRUCT, _format_notch_filtering))
+
+
 @app.command("set")
 def set_notch_filtering(
     sysid: str = typer.Option(
@@ -122,96 +122,73 @@ def set_notch_filtering(
         orbfix cmd notch-filtering set --mode off --centerfreq 1254.234 --bandwidth 56
         orbfix cmd notch-filtering set -m auto -cf 1337.67 -b 67
     """
+    secho = typer.secho
+    Exit = typer.Exit
 
-    sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
-    from ..common.config import get_default_port
-    from pathlib import Path
-
-    saved = get_default_port()
-    resolved_port = port or (saved if saved and Path(saved).exists() else None)
-    if not resolved_port:
-        import typer as _t
-
-        _t.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise _t.Exit(code=2)
+    sys_id_val = sysid_value(sysid)
+    resolved_port = resolve_port(port)
 
     # Build payload
     if payload:
         # User provided raw hex payload
         payload_bytes = parse_payload_spec(payload)
         if len(payload_bytes) != 7:
-            typer.secho(
+            secho(
                 f"Warning: Payload is {len(payload_bytes)} bytes (expected 7 for notch filtering)",
                 fg="yellow",
             )
     else:
-        # modes
-        mode_map = {
-            0: "auto",
-            1: "off",
-            2: "manual",
-        }
-
-        # Reverse map for name lookup
-        mode_name_to_index = {name: idx for idx, name in mode_map.items()}
-
         mode_val = 0
         centerfreq_val = 0.0
         bandwidth_val = 0
 
         if default_filter is True:
             # Set default values for notch filtering
-            interval_val = mode_name_to_index["auto"]
+            mode_val = _MODE_NAME_TO_INDEX["auto"]
             centerfreq_val = 1100.0
             bandwidth_val = 30
 
         if mode is not None:
             # Set mode
-            if mode not in mode_name_to_index:
-                typer.secho(f"Error: Unknown mode name '{mode}'", fg="red")
-                typer.secho(
-                    f"Valid names: {', '.join(sorted(mode_name_to_index.keys()))}",
+            if mode not in _MODE_NAME_TO_INDEX:
+                secho(f"Error: Unknown mode name '{mode}'", fg="red")
+                secho(
+                    f"Valid names: {', '.join(sorted(_MODE_NAME_TO_INDEX.keys()))}",
                     fg="yellow",
                 )
-                raise typer.Exit(code=1)
-            mode_val = mode_name_to_index[mode]
+                raise Exit(code=1)
+            mode_val = _MODE_NAME_TO_INDEX[mode]
 
         if centerfreq is not None:
             # Set center frequency
             if not 1100.0 <= centerfreq <= 1700.0:
-                typer.secho(
+                secho(
                     f"Error: Center frequency value must be  1100.0 .. 1700.0 MHz",
                     fg="red",
                 )
-                raise typer.Exit(code=1)
+                raise Exit(code=1)
             centerfreq_val = centerfreq
 
         if bandwidth is not None:
             # Set bandwidth value
             if not 30 <= bandwidth <= 1600:
-                typer.secho(f"Error: Bandwidth value must be 30 .. 1600 KHz", fg="red")
-                raise typer.Exit(code=1)
+                secho(f"Error: Bandwidth value must be 30 .. 1600 KHz", fg="red")
+                raise Exit(code=1)
             bandwidth_val = bandwidth
 
-        import struct
-
-        payload_bytes = struct.pack(
-            ">B" "f" "H",
-            mode_val,
-            centerfreq_val,
-            bandwidth_val,
-        )
+        if default_filter is True and mode is None and centerfreq is None and bandwidth is None:
+            payload_bytes = _DEFAULT_NOTCH_PAYLOAD
+        else:
+            payload_bytes = _NOTCH_STRUCT.pack(mode_val, centerfreq_val, bandwidth_val)
 
         # Show what we're sending
-        typer.secho(f"Notch filtering:\n", fg="cyan", bold=True)
-        typer.secho(
-            f"   mode:            {mode_val:2d}:{mode_map.get(mode_val, f"Mode_{mode_val}"):12s}"
+        secho(f"Notch filtering:\n", fg="cyan", bold=True)
+        secho(
+            f"   mode:            {mode_val:2d}:{_MODE_DISPLAY[mode_val]:12s}"
         )
-        typer.secho(f"   Center Frequency: {centerfreq_val:.3f} [MHz]")
-        typer.secho(f"   Bandwidth:        {bandwidth_val} [KHz]")
+        secho(f"   Center Frequency: {centerfreq_val:.3f} [MHz]")
+        secho(f"   Bandwidth:        {bandwidth_val} [KHz]")
         typer.echo()
-    from serial import SerialException
-
     try:
         send_and_receive(
             port=resolved_port,
@@ -223,9 +200,9 @@ def set_notch_filtering(
             payload=payload_bytes,
             decode=(not no_decode),
         )
-    except SerialException as e:
-        typer.secho(f"Serial error: {e}", fg="red")
-        raise typer.Exit(code=1)
+    except _SerialException as e:
+        secho(f"Serial error: {e}", fg="red")
+        raise Exit(code=1)
 
 
 @app.command("get")
@@ -242,22 +219,10 @@ def get_pps_parameters(
     no_decode: bool = typer.Option(False, help="Do not decode frames; just dump hex"),
 ):
     """Get current Notch filtering configuration."""
-    sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
-    from ..common.config import get_default_port
-    from ..transport.serial_rs422 import find_usb_device
-    from pathlib import Path
-
-    saved = get_default_port()
-    resolved_port = port or (saved if saved and Path(saved).exists() else None)
-    if not resolved_port:
-        import typer as _t
-
-        _t.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise _t.Exit(code=2)
+    sys_id_val = sysid_value(sysid)
+    resolved_port = resolve_port(port)
 
     payload = b""
-    from serial import SerialException
-
     try:
         send_and_receive(
             port=resolved_port,
@@ -269,6 +234,6 @@ def get_pps_parameters(
             payload=payload,
             decode=(not no_decode),
         )
-    except SerialException as e:
+    except _SerialException as e:
         typer.secho(f"Serial error: {e}", fg="red")
         raise typer.Exit(code=1)
@@ -1,23 +1,35 @@
 from __future__ import annotations
 import struct
 import typer
+from serial import SerialException as _SerialException
 from ..common.io_utils import parse_one_byte_spec
 from ..transport.serial_rs422 import find_usb_device, DEFAULT_BAUD, DEFAULT_READ_TIMEOUT_S
-from .base import send_and_receive, DEFAULT_OVERALL_WAIT_S
+from .base import send_and_receive, DEFAULT_OVERALL_WAIT_S, sysid_value
 from .parsers import register
-from ..common.config import get_default_port
-from pathlib import Path
-from serial import SerialException
+from ..common.config import resolve_port
 
 app = typer.Typer(help="Set antenna offset for OrbFIX")
 
 CMD_ID = 0x000C
 DEFAULT_SYSID = "0x6A"
 
+# DeltaE, DeltaN, DeltaU (F4 each, metres)
+_ANT_STRUCT = struct.Struct(">fff")
+
 @register(CMD_ID)
-def _parse_antenna_offset_response(decoded):
+def _parse_antenna_offset_response(decoded, _unpack=_ANT_STRUCT.unpack_from, _size=_ANT_STRUCT.size):
     pl: bytes = getattr(decoded, "payload", b"") or b""
-    return (f"Incoming (hex): {pl.hex()}", {"payload_hex": pl.hex()})
+    if len(pl) < _size:
+        return (f"Incoming (hex): {pl.hex()}", {"payload_hex": pl.hex()})
+
+    delta_e, delta_n, delta_u = _unpack(pl, 0)
+    result = (
+        "Antenna Offset:\n"
+        f"  DeltaE: {delta_e:.4f} [m]\n"
+        f"  DeltaN: {delta_n:.4f} [m]\n"
+        f"  DeltaU: {delta_u:.4f} [m]"
+    )
+    return (result, {"delta_e": delta_e, "delta_n": delta_n, "delta_u": delta_u})
 
 @app.command("set")
 def set_antenna_offset(
@@ -32,30 +44,26 @@ def set_antenna_offset(
     delta_u: float = typer.Option(..., help="Antenna offset Up (m)"),
 ):
     """Set the antenna reference point offsets (ENU) for the GNSS system."""
-    
-    # parse sysid -> int
+    secho = typer.secho
+    Exit = typer.Exit
+
+    # parse sysid -> int (an empty spec is an error here, not 0)
     sys_id_val = parse_one_byte_spec(sysid, what="system id")
     if sys_id_val is None:
-        typer.secho(f"Invalid system id spec: {sysid!r}", fg="red")
-        raise typer.Exit(code=2)
+        secho(f"Invalid system id spec: {sysid!r}", fg="red")
+        raise Exit(code=2)
     
     # resolve serial port
-    saved = get_default_port()
-    resolved_port = None
-
+    detected = None
     if auto:
         detected = find_usb_device()
-        if detected:
-            resolved_port = detected
-        else:
-            typer.secho("Auto-detect failed to find a USB device.", fg="yellow")
+        if not detected:
+            secho("Auto-detect failed to find a USB device.", fg="yellow")
 
-    resolved_port = resolved_port or port or (saved if saved and Path(saved).exists() else None)
+    resolved_port = resolve_port(detected or port)
+
+    payload_bytes = _ANT_STRUCT.pack(delta_e, delta_n, delta_u)
 
-    if not resolved_port:
-        typer.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise typer.Exit(code=2)
-    
     try:
         send_and_receive(
             port=resolved_port,
@@ -67,9 +75,9 @@ def set_antenna_offset(
             payload=payload_bytes,
             decode=True,
         )
-    except SerialException as e:
-        typer.secho(f"Serial error: {e}", fg="red")
-        raise typer.Exit(code=1)
+    except _SerialException as e:
+        secho(f"Serial error: {e}", fg="red")
+        raise Exit(code=1)
 
 @app.command("get")
 def get_antenna_offset(
@@ -80,23 +88,11 @@ def get_antenna_offset(
     wait: float = typer.Option(DEFAULT_OVERALL_WAIT_S, help="Overall receive window (s)"),
     no_decode: bool = typer.Option(False, help="Do not decode frames; just dump hex"),
 ):
-    sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
-    from ..common.config import get_default_port
-    from ..transport.serial_rs422 import find_usb_device
-    from pathlib import Path
-    saved = get_default_port()
-    resolved_port = (
-        port
-        or (saved if saved and Path(saved).exists() else None)
-    )
-    if not resolved_port:
-        import typer as _t
-        _t.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise _t.Exit(code=2)
+    sys_id_val = sysid_value(sysid)
+    resolved_port = resolve_port(port)
 
     payload = b""
 
-    from serial import SerialException
     try:
         send_and_receive(
             port=resolved_port,
@@ -108,6 +104,6 @@ def get_antenna_offset(
             payload=payload,
             decode=(not no_decode),
         )
-    except SerialException as e:
+    except _SerialException as e:
         typer.secho(f"Serial error: {e}", fg="red")
         raise typer.Exit(code=1)
\ No newline at end of file
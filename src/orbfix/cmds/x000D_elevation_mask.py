@@ -1,18 +1,38 @@
 from __future__ import annotations
+import struct
 import typer
-from ..common.io_utils import parse_one_byte_spec, parse_payload_spec
+from serial import SerialException as _SerialException
+from ..common.io_utils import parse_payload_spec, is_printable_ascii
 from ..transport.serial_rs422 import find_usb_device, DEFAULT_BAUD, DEFAULT_READ_TIMEOUT_S
-from .base import send_and_receive, DEFAULT_OVERALL_WAIT_S
+from .base import send_and_receive, DEFAULT_OVERALL_WAIT_S, sysid_value
 from .parsers import register
+from ..common.config import resolve_port
 
 app = typer.Typer(help="Request OrbFIX firmware/version info.")
 
 CMD_ID = 0x000d
 DEFAULT_SYSID = "0x6A"
 
+# Engine (X1), Mask (I1)
+_ELEV = struct.Struct(">Bb")
+
+# Engine name -> byte for SET
+_ENGINE_MAP = {
+    "tracking": 0x00,
+    "pvt": 0x01,
+    "all": 0x02,
+}
+
+# Engine byte -> name for GET responses
+_ENGINE_NAMES = {
+    0x00: "Tracking",
+    0x01: "PVT",
+    0x02: "all",
+}
+
 # Parser for responses to this command
 @register(CMD_ID)
-def _parse_elevation_mask(decoded):
+def _parse_elevation_mask(decoded, _unpack=_ELEV.unpack_from, _names=_ENGINE_NAMES):
     """
     Command 0x0014: Elevation Mask (Get/Set)
     Payload: 2 bytes
@@ -22,42 +42,35 @@ def _parse_elevation_mask(decoded):
     pl: bytes = getattr(decoded, "payload", b"") or b""
 
     if len(pl) < 4:
-        try:
-            s = pl.rstrip(b"\x00").decode("utf-8")
-            if s and all(31 < ord(ch) < 127 or ch in "\r\n\t ._:-/()" for ch in s):
-                return (f"Received: {s}", {"received": s})
-        except Exception:
-            pass
-
-    # Parse the 2 bytes
-    bitfield_map = {
-        0x00: "Tracking",
-        0x01: "PVT",
-        0x02: "all",
-    }
+        raw = pl.rstrip(b"\x00")
+        if is_printable_ascii(raw):
+            s = raw.decode("ascii")
+            return (f"Received: {s}", {"received": s})
 
     engine_str = []
     mask_values = []
 
-    for i in range(0, len(pl), 2):     # 0, 2
-        engine = pl[i]          # pl[0], pl[2]
-        mask = int.from_bytes(pl[i+1:i+2], "big", signed=True)  # pl[1], pl[3]
+    # One (engine, mask) pair per 2 bytes; a trailing odd byte is ignored
+    for i in range(0, len(pl) - 1, 2):     # 0, 2
+        engine, mask = _unpack(pl, i)
 
         # Convert engine to text
-        engine_str.append(bitfield_map.get(engine, f"Unknown({engine})"))
+        engine_str.append(_names.get(engine, f"Unknown({engine})"))
         mask_values.append(mask)
-        if pl[2] == 0:
+        if len(pl) > 2 and pl[2] == 0:
             break
 
-    result = "Elevation Mask Level:\n"
-    result += f"  Engine: {engine_str}\n"
-    result += f"  Mask: {mask_values}\n"
+    result = (
+        "Elevation Mask Level:\n"
+        f"  Engine: {engine_str}\n"
+        f"  Mask: {mask_values}\n"
+    )
 
     return (
         result,
         {
             "engine": engine_str,
-            "mask": str(mask),
+            "mask": str(mask_values[-1]) if mask_values else "",
         }
     )
 
@@ -84,66 +97,41 @@ def set_elevation_mask(
     # Raw payload
       orbfix cmd elevation-mask set --payload 01002D
     """
-    sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
-    from ..common.config import get_default_port
-    from pathlib import Path
-    saved = get_default_port()
-    resolved_port = (
-        port
-        or (saved if saved and Path(saved).exists() else None)
-    )
-    if not resolved_port:
-        import typer as _t
-        _t.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise _t.Exit(code=2)
+    secho = typer.secho
+    Exit = typer.Exit
+
+    sys_id_val = sysid_value(sysid)
+    resolved_port = resolve_port(port)
 
     # Build payload
     if payload:
         payload_bytes = parse_payload_spec(payload)
         if len(payload_bytes) != 4:
-            typer.secho(f"Warning: Payload is {len(payload_bytes)} bytes (expected 4)", fg="yellow")
+            secho(f"Warning: Payload is {len(payload_bytes)} bytes (expected 4)", fg="yellow")
     else:
-        # All parameters required for SET
-        if not all([engine, mask]):
-            typer.secho("Error: All parameters required: --threshold --startupsync", fg="red")
-            raise typer.Exit(code=1)
-
-        # System mapping
-        engine_map = {
-            "tracking": 0x00,
-            "pvt": 0x01,
-            "all": 0x02,
-        }
-
-        # Validate bitfield
-        engine_lower = engine.lower()
-        if engine_lower not in engine_map:
-            typer.secho("Error: selector must be Tracking, PVT, or all", fg="red")
-            raise typer.Exit(code=1)
+        # Missing and unknown engine are caught by the same lookup
+        engine_byte = _ENGINE_MAP.get((engine or "").lower())
+        if engine_byte is None:
+            secho("Error: --engine must be Tracking, PVT, or all", fg="red")
+            raise Exit(code=1)
 
-        engine_byte = engine_map[engine_lower]
-
-        # Validate -90..90
+        # Validate -90..90 (also rejects a missing --mask)
         try:
             mask_value = int(mask)
             if mask_value < -90 or mask_value > 90:
                 raise ValueError
-        except ValueError:
-            typer.secho("Angle must be between -90 and 90", fg="red")
-            raise typer.Exit(code=1)
-
-        # Convert to 1 bytes signed
-        mask_bytes = mask_value.to_bytes(1, "big", signed=True)
+        except (TypeError, ValueError):
+            secho("Angle must be between -90 and 90", fg="red")
+            raise Exit(code=1)
 
         # Build final payload (2 bytes)
-        payload_bytes = bytes([engine_byte]) + mask_bytes
+        payload_bytes = _ELEV.pack(engine_byte, mask_value)
 
-        typer.secho("\nElevation Mask configuration:", fg="cyan", bold=True)
-        typer.secho(f"  Engine: {engine}", fg="green")
-        typer.secho(f"  Mask: {mask_value}", fg="green")
+        secho("\nElevation Mask configuration:", fg="cyan", bold=True)
+        secho(f"  Engine: {engine}", fg="green")
+        secho(f"  Mask: {mask_value}", fg="green")
         typer.echo()
 
-    from serial import SerialException
     try:
         send_and_receive(
             port=resolved_port,
@@ -155,9 +143,9 @@ def set_elevation_mask(
             payload=payload_bytes,
             decode=(not no_decode),
         )
-    except SerialException as e:
-        typer.secho(f"Serial error: {e}", fg="red")
-        raise typer.Exit(code=1)
+    except _SerialException as e:
+        secho(f"Serial error: {e}", fg="red")
+        raise Exit(code=1)
 
 
 @app.command("get")
@@ -170,23 +158,12 @@ def get_elevation_mask(
     no_decode: bool = typer.Option(False, help="Do not decode frames; just dump hex"),
 ):
     """Get current Elevation Mask configuration."""
-    sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
-    from ..common.config import get_default_port
-    from pathlib import Path
-    saved = get_default_port()
-    resolved_port = (
-        port
-        or (saved if saved and Path(saved).exists() else None)
-    )
-    if not resolved_port:
-        import typer as _t
-        _t.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise _t.Exit(code=2)
+    sys_id_val = sysid_value(sysid)
+    resolved_port = resolve_port(port)
 
     # Empty payload for GET
     payload_bytes = b""
 
-    from serial import SerialException
     try:
         send_and_receive(
             port=resolved_port,
@@ -198,6 +175,6 @@ def get_elevation_mask(
             payload=payload_bytes,
             decode=(not no_decode),
         )
-    except SerialException as e:
+    except _SerialException as e:
         typer.secho(f"Serial error: {e}", fg="red")
         raise typer.Exit(code=1)
@@ -1,49 +1,53 @@
 from __future__ import annotations
+import struct
 import typer
-from ..common.io_utils import parse_one_byte_spec, parse_payload_spec
+from serial import SerialException as _SerialException
+from ..common.io_utils import parse_payload_spec
 from ..transport.serial_rs422 import find_usb_device, DEFAULT_BAUD, DEFAULT_READ_TIMEOUT_S
-from .base import send_and_receive, DEFAULT_OVERALL_WAIT_S
-from .parsers import register
+from .base import send_and_receive, DEFAULT_OVERALL_WAIT_S, sysid_value
+from .parsers import ParserSpec, register_spec
+from ..common.config import resolve_port
 
 app = typer.Typer(help="Get or set the type of model used to correct ionospheric errors.")
 
 CMD_ID = 0x000E
 DEFAULT_SYSID = "0x6A"
 
-# Parser for responses to this command
-@register(CMD_ID)
-def _parse_ionosphere_model(decoded):
+# Model (U1)
+_MODEL_STRUCT = struct.Struct(">B")
+
+# Model name -> byte for SET
+_MODEL_MAP = {
+    "auto": 0x00,
+    "off": 0x01,
+    "klobuchargps": 0x02,
+    "sbas": 0x03,
+    "multifreq": 0x04,
+    "klobucharbds": 0x05,
+}
+
+# Model byte -> name for GET responses
+_MODEL_NAMES = {
+    0x00: "Auto",
+    0x01: "Off",
+    0x02: "KlobucharGPS",
+    0x03: "SBAS",
+    0x04: "MultiFreq",
+    0x05: "KlobucharBDS",
+}
+
+# Display name for every possible model byte, unknown values included
+_MODEL_DISPLAY = [_MODEL_NAMES.get(i, f"Unknown(0x{i:02X})") for i in range(256)]
+
+def _format_ionosphere_model(model, _display=_MODEL_DISPLAY):
     """
     Command 0x000E: Ionosphere Model (Get/Set)
-    Payload: 4 bytes
+    Payload: 1 byte
       - Byte 0 (U1): Model
     """
-    pl: bytes = getattr(decoded, "payload", b"") or b""
-
-    if len(pl) < 1:
-        try:
-            s = pl.rstrip(b"\x00").decode("utf-8")
-            if s and all(31 < ord(ch) < 127 or ch in "\r\n\t ._:-/()" for ch in s):
-                return (f"Received: {s}", {"received": s})
-        except Exception:
-            pass
-
-    model = pl[0]
-
-    # Model mapping
-    model_map = {
-        0x00: "Auto",
-        0x01: "Off",
-        0x02: "KlobucharGPS",
-        0x03: "SBAS",
-        0x04: "MultiFreq",
-        0x05: "KlobucharBDS",
-    }
+    model_str = _display[model]
 
-    model_str = model_map.get(model, f"Unknown(0x{model:02X})")
-
-    result = "Ionosphere Model:\n"
-    result += f"  Model: {model_str}\n"
+    result = f"Ionosphere Model:\n  Model: {model_str}\n"
 
     return (
         result,
@@ -53,6 +57,9 @@ def _parse_ionosphere_model(decoded):
         }
     )
 
+# Parser for responses to this command
+register_spec(CMD_ID, ParserSpec(_MODEL_STRUCT, _format_ionosphere_model))
+
 @app.command("set")
 def set_ionosphere_model(
     sysid: str = typer.Option(DEFAULT_SYSID, "--sysid", "--subsys", help="System/Subsys ID (1 byte)"),
@@ -75,56 +82,32 @@ def set_ionosphere_model(
     # Raw payload
       orbfix cmd ionosphere-model set --payload 03
     """
-    sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
-    from ..common.config import get_default_port
-    from pathlib import Path
-    saved = get_default_port()
-    resolved_port = (
-        port
-        or (saved if saved and Path(saved).exists() else None)
-    )
-    if not resolved_port:
-        import typer as _t
-        _t.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise _t.Exit(code=2)
+    secho = typer.secho
+    Exit = typer.Exit
+
+    sys_id_val = sysid_value(sysid)
+    resolved_port = resolve_port(port)
 
     # Build payload
     if payload:
         payload_bytes = parse_payload_spec(payload)
         if len(payload_bytes) != 1:
-            typer.secho(f"Warning: Payload is {len(payload_bytes)} bytes (expected 1)", fg="yellow")
+            secho(f"Warning: Payload is {len(payload_bytes)} bytes (expected 1)", fg="yellow")
     else:
-        # All parameters required for SET
-        if not all([model]):
-            typer.secho("Error: All parameters required: --model", fg="red")
-            raise typer.Exit(code=1)
-
-        # Model mapping
-        model_map = {
-            "auto": 0x00,
-            "off": 0x01,
-            "klobuchargps": 0x02,
-            "sbas": 0x03,
-            "multifreq": 0x04,
-            "klobucharbds": 0x05,
-        }
-
-        # Parse and validate
-        model_lower = model.lower()
-        if model_lower not in model_map:
-            typer.secho(f"Error: Unknown satellite '{model}'", fg="red")
-            typer.secho(f"Valid values: {', '.join(model_map.keys())}", fg="yellow")
-            raise typer.Exit(code=1)
-        model_byte = model_map[model_lower]
+        # Missing and unknown model are caught by the same lookup
+        model_byte = _MODEL_MAP.get(model.lower() if model else None)
+        if model_byte is None:
+            secho(f"Error: Unknown model '{model}'" if model else "Error: All parameters required: --model", fg="red")
+            secho(f"Valid values: {', '.join(_MODEL_MAP.keys())}", fg="yellow")
+            raise Exit(code=1)
 
         payload_bytes = bytes([model_byte])
 
         # Show configuration
-        typer.secho("\nIonosphere Model Configuration:", fg="cyan", bold=True)
-        typer.secho(f"  Model: {model}", fg="green")
+        secho("\nIonosphere Model Configuration:", fg="cyan", bold=True)
+        secho(f"  Model: {model}", fg="green")
         typer.echo()
 
-    from serial import SerialException
     try:
         send_and_receive(
             port=resolved_port,
@@ -136,9 +119,9 @@ def set_ionosphere_model(
             payload=payload_bytes,
             decode=(not no_decode),
         )
-    except SerialException as e:
-        typer.secho(f"Serial error: {e}", fg="red")
-        raise typer.Exit(code=1)
+    except _SerialException as e:
+        secho(f"Serial error: {e}", fg="red")
+        raise Exit(code=1)
 
 
 @app.command("get")
@@ -151,23 +134,12 @@ def get_ionosphere_model(
     no_decode: bool = typer.Option(False, help="Do not decode frames; just dump hex"),
 ):
     """Get current Ionosphere Model configuration."""
-    sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
-    from ..common.config import get_default_port
-    from pathlib import Path
-    saved = get_default_port()
-    resolved_port = (
-        port
-        or (saved if saved and Path(saved).exists() else None)
-    )
-    if not resolved_port:
-        import typer as _t
-        _t.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise _t.Exit(code=2)
+    sys_id_val = sysid_value(sysid)
+    resolved_port = resolve_port(port)
 
     # Empty payload for GET
     payload_bytes = b""
 
-    from serial import SerialException
     try:
         send_and_receive(
             port=resolved_port,
@@ -179,6 +151,6 @@ def get_ionosphere_model(
             payload=payload_bytes,
             decode=(not no_decode),
         )
-    except SerialException as e:
+    except _SerialException as e:
         typer.secho(f"Serial error: {e}", fg="red")
         raise typer.Exit(code=1)
@@ -1,18 +1,40 @@
 from __future__ import annotations
 
+from enum import Enum
+
 import typer
 
-from ..common.io_utils import parse_one_byte_spec
-from ..transport.serial_rs422 import find_usb_device, DEFAULT_BAUD, DEFAULT_READ_TIMEOUT_S
-from .base import send_and_receive, DEFAULT_OVERALL_WAIT_S
-from .parsers import register
+from ..common.io_utils import parse_payload_spec
+from ..transport.serial_rs422 import DEFAULT_BAUD, DEFAULT_READ_TIMEOUT_S
+from .base import run_cmd, DEFAULT_OVERALL_WAIT_S, sysid_value
+from .parsers import register, short_payload
 
 app = typer.Typer(help="Set OrbFIX PVT mode (simple/normal).")
 
 DEFAULT_SYSID = "0x6A"
+_EXPECTED_LEN = 2  # payload bytes for set
 
 CMD_ID = 0x000F
 
+# RoverMode bitfield: bit i enables _ROVER_FEATURES[i]
+_ROVER_FEATURES = ("RTKFixed", "RTKFloat", "DGNSS", "SBAS", "Standalone")
+
+# Enabled feature names for each of the 32 possible 5-bit RoverMode values
+_ROVER_DECODE = tuple(
+    tuple(name for i, name in enumerate(_ROVER_FEATURES) if (bf >> i) & 1)
+    for bf in range(32)
+)
+
+# Lower-cased feature name -> RoverMode bit position
+_ROVER_FEATURE_BITS = {name.lower(): i for i, name in enumerate(_ROVER_FEATURES)}
+
+# Payloads for the common cases: static, and rover with every feature enabled
+_PAYLOAD_STATIC = b"\x00\x1F"
+_PAYLOAD_ROVER_ALL = b"\x01\x1F"
+
+# Accepted --mode values, checked by Typer when the command line is parsed
+_PvtMode = Enum("_PvtMode", {"static": "static", "rover": "rover"}, type=str)
+
 # Parser for responses to this command
 @register(CMD_ID)
 def _parse_PVTMode(decoded):
@@ -32,10 +54,7 @@ def _parse_PVTMode(decoded):
     pl: bytes = getattr(decoded, "payload", b"") or b""
 
     if len(pl) < 2:
-        return (
-            f"Payload too short: {len(pl)} bytes (expected 2)",
-            {"error": "short_payload", "received_bytes": len(pl)}
-        )
+        return short_payload(len(pl), 2)
 
     mode = pl[0]
     rover_mode_bitfield = pl[1]
@@ -43,42 +62,29 @@ def _parse_PVTMode(decoded):
     # Mode interpretation
     mode_str = "static" if mode == 0 else "rover" if mode == 1 else f"unknown({mode})"
 
-    result = f"PVT Mode: {mode_str}\n"
+    lines = [f"PVT Mode: {mode_str}"]
+    enabled_features = None
 
     # If rover mode, decode the bitfield
     if mode == 1:
-        rover_features = {
-            0: "RTKFixed",
-            1: "RTKFloat",
-            2: "DGNSS",
-            3: "SBAS",
-            4: "Standalone",
-        }
-
-        enabled_features = []
-        for bit_pos, feature_name in rover_features.items():
-            if (rover_mode_bitfield >> bit_pos) & 1:
-                enabled_features.append(feature_name)
-
+        enabled_features = _ROVER_DECODE[rover_mode_bitfield & 0x1F]
         if enabled_features:
-            result += f"  Rover mode features enabled:\n"
-            for feature in enabled_features:
-                result += f"    • {feature}\n"
-            result = result.rstrip("\n")
+            lines.append("  Rover mode features enabled:")
+            lines.extend(f"    • {feature}" for feature in enabled_features)
         else:
-            result += f"  Rover mode: no features enabled (bitfield=0x{rover_mode_bitfield:02X})"
+            lines.append(f"  Rover mode: no features enabled (bitfield=0x{rover_mode_bitfield:02X})")
     elif mode == 0:
         # Static mode - bitfield ignored
         if rover_mode_bitfield != 0:
-            result += f"  (RoverMode bitfield=0x{rover_mode_bitfield:02X}, ignored in static mode)"
+            lines.append(f"  (RoverMode bitfield=0x{rover_mode_bitfield:02X}, ignored in static mode)")
 
     return (
-        result,
+        "\n".join(lines),
         {
             "mode": mode_str,
             "mode_value": mode,
             "rover_mode_bitfield": f"0x{rover_mode_bitfield:02X}",
-            "rover_features_enabled": enabled_features if mode == 1 else None,
+            "rover_features_enabled": enabled_features,
         }
     )
 
@@ -91,7 +97,10 @@ def set_pvt_mode(
     wait: float = typer.Option(DEFAULT_OVERALL_WAIT_S, help="Overall receive window (s)"),
     no_decode: bool = typer.Option(False, help="Do not decode frames; just dump hex"),
     # User-friendly options
-    mode: str = typer.Option(None, "--mode", "-m", help="PVT mode: 'static' or 'rover'"),
+    mode: _PvtMode = typer.Option(
+        None, "--mode", "-m", help="PVT mode: 'static' or 'rover'",
+        case_sensitive=False,
+    ),
     rover_features: list[str] = typer.Option(None, "--feature", "-f", help="Enable rover feature: 'SBAS', 'RTKFloat', etc."),
     rover_bitfield: str = typer.Option(None, "--rover-bitfield", help="Raw rover mode bitfield (hex, e.g., '0x15')"),
     payload: str | None = typer.Option(None, "--payload", help="Raw hex payload (overrides other options)"),
@@ -112,44 +121,29 @@ def set_pvt_mode(
       # Set rover mode, all features enabled
       orbfix cmd pvt-mode set -m rover -f RTKFixed -f RTKFloat -f DGNSS -f SBAS -f Standalone
     """
-    sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
-    from ..common.config import get_default_port
-    from pathlib import Path
-    saved = get_default_port()
-    resolved_port = (
-        port
-        or (saved if saved and Path(saved).exists() else None)
-    )
-    if not resolved_port:
-        import typer as _t
-        _t.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise _t.Exit(code=2)
+    sys_id_val = sysid_value(sysid)
 
     # Build payload
     if payload:
         # User provided raw hex payload
         payload_bytes = parse_payload_spec(payload)
-        if len(payload_bytes) != 2:
-            typer.secho(f"Warning: Payload is {len(payload_bytes)} bytes (expected 2 for PVT mode)", fg="yellow")
+        if len(payload_bytes) != _EXPECTED_LEN:
+            typer.secho(f"Error: Payload is {len(payload_bytes)} bytes (expected {_EXPECTED_LEN} for PVT mode)", fg="red")
+            raise typer.Exit(code=1)
     else:
         # Build from user-friendly options
         if mode is None:
             typer.secho("Error: --mode is required (use 'static' or 'rover')", fg="red")
             raise typer.Exit(code=1)
 
-        mode_lower = mode.lower()
-        if mode_lower == "static":
+        # --mode is validated by Typer against _PvtMode
+        if mode is _PvtMode.static:
             mode_byte = 0
             rover_mode_byte = 0x1F  # Ignored in static mode
-        elif mode_lower == "rover":
+            payload_bytes = _PAYLOAD_STATIC
+        else:
             mode_byte = 1
-            rover_feature_map = {
-                "rtkfixed": 0,
-                "rtkfloat": 1,
-                "dgnss": 2,
-                "sbas": 3,
-                "standalone":4,
-            }
+            payload_bytes = None
 
             if rover_bitfield is not None:
                 # User provided raw bitfield
@@ -170,54 +164,39 @@ def set_pvt_mode(
                 rover_mode_byte = 0
                 for feature in rover_features:
                     feature_lower = feature.lower()
-                    if feature_lower in rover_feature_map:
-                        bit_pos = rover_feature_map[feature_lower]
+                    if feature_lower in _ROVER_FEATURE_BITS:
+                        bit_pos = _ROVER_FEATURE_BITS[feature_lower]
                         rover_mode_byte |= (1 << bit_pos)
                     else:
                         typer.secho(f"Error: Unknown rover feature '{feature}'", fg="red")
-                        typer.secho(f"Valid features: {', '.join(rover_feature_map.keys())}", fg="yellow")
+                        typer.secho(f"Valid features: {', '.join(_ROVER_FEATURE_BITS)}", fg="yellow")
                         raise typer.Exit(code=1)
             else:
-                # Rover mode with no features enabled
+                # No bitfield or features given: enable every feature
                 rover_mode_byte = 0x1F
-        else:
-            typer.secho(f"Error: Invalid mode '{mode}'. Use 'static' or 'rover'", fg="red")
-            raise typer.Exit(code=1)
+                payload_bytes = _PAYLOAD_ROVER_ALL
 
-        payload_bytes = bytes([mode_byte, rover_mode_byte])
+            if payload_bytes is None:
+                payload_bytes = bytes((mode_byte, rover_mode_byte))
 
-        # Show what we're sending
-        typer.secho("\nPVT Mode Configuration:", fg="cyan", bold=True)
+        # Show what we're sending (one write for the whole banner)
+        lines = [typer.style("\nPVT Mode Configuration:", fg="cyan", bold=True)]
         if mode_byte == 0:
-            typer.secho("  Mode: static", fg="green")
+            lines.append(typer.style("  Mode: static", fg="green"))
         else:
-            typer.secho("  Mode: rover", fg="green")
+            lines.append(typer.style("  Mode: rover", fg="green"))
             if rover_mode_byte > 0:
-                typer.secho(f"  Rover mode bitfield: 0x{rover_mode_byte:02X}", fg="white")
-                enabled = [name for name, bit in rover_feature_map.items() if (rover_mode_byte >> bit) & 1]
+                lines.append(typer.style(f"  Rover mode bitfield: 0x{rover_mode_byte:02X}", fg="white"))
+                enabled = _ROVER_DECODE[rover_mode_byte & 0x1F]
                 if enabled:
-                    typer.secho("  Enabled features:", fg="white")
-                    for feature in enabled:
-                        typer.secho(f"    • {feature}", fg="green")
+                    lines.append(typer.style("  Enabled features:", fg="white"))
+                    lines.extend(typer.style(f"    • {feature}", fg="green") for feature in enabled)
             else:
-                typer.secho("  Rover mode: no features enabled", fg="yellow")
-        typer.echo()
-
-    from serial import SerialException
-    try:
-        send_and_receive(
-            port=resolved_port,
-            baudrate=baud,
-            read_timeout_s=timeout,
-            overall_wait_s=wait,
-            cmd_id=CMD_ID,
-            sysid=sys_id_val,
-            payload=payload_bytes,
-            decode=(not no_decode),
-        )
-    except SerialException as e:
-        typer.secho(f"Serial error: {e}", fg="red")
-        raise typer.Exit(code=1)
+                lines.append(typer.style("  Rover mode: no features enabled", fg="yellow"))
+        lines.append("")
+        typer.echo("\n".join(lines))
+
+    run_cmd(CMD_ID, sys_id_val, payload_bytes, port=port, baud=baud, timeout=timeout, wait=wait, decode=not no_decode)
 
 
 @app.command("get")
@@ -230,33 +209,6 @@ def pvt_mode(
     wait: float = typer.Option(DEFAULT_OVERALL_WAIT_S, help="Overall receive window (s)"),
     no_decode: bool = typer.Option(False, help="Do not decode frames; just dump hex"),
 ):
-    sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
-    from ..common.config import get_default_port
-    from ..transport.serial_rs422 import find_usb_device
-    from pathlib import Path
-    saved = get_default_port()
-    resolved_port = (
-        port
-        or (saved if saved and Path(saved).exists() else None)
-    )
-    if not resolved_port:
-        import typer as _t
-        _t.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise _t.Exit(code=2)
-
-    payload = b""
-    from serial import SerialException
-    try:
-        send_and_receive(
-            port=resolved_port,
-            baudrate=baud,
-            read_timeout_s=timeout,
-            overall_wait_s=wait,
-            cmd_id=CMD_ID,
-            sysid=sys_id_val,
-            payload=payload,
-            decode=(not no_decode),
-        )
-    except SerialException as e:
-        typer.secho(f"Serial error: {e}", fg="red")
-        raise typer.Exit(code=1)
+    sys_id_val = sysid_value(sysid)
+
+    run_cmd(CMD_ID, sys_id_val, b"", port=port, baud=baud, timeout=timeout, wait=wait, decode=not no_decode)
@@ -1,19 +1,18 @@
 from __future__ import annotations
 import typer
-from ..common.io_utils import parse_one_byte_spec
 from ..common.io_utils import parse_payload_spec
 from ..transport.serial_rs422 import (
-    find_usb_device,
     DEFAULT_BAUD,
     DEFAULT_READ_TIMEOUT_S,
 )
-from .base import send_and_receive, DEFAULT_OVERALL_WAIT_S
-from .parsers import register
+from .base import run_cmd, DEFAULT_OVERALL_WAIT_S, sysid_value
+from .parsers import register, short_payload
 
 app = typer.Typer(help="Reset navigation filter.")
 
 CMD_ID = 0x0012
 DEFAULT_SYSID = "0x6A"
+_EXPECTED_LEN = 1  # payload bytes for set
 
 
 @register(CMD_ID)
@@ -25,18 +24,16 @@ def _parse_reset_navigation_filter(decoded):
     """
     pl: bytes = getattr(decoded, "payload", b"") or b""
 
-    if len(pl) < 1:
-        try:
-            s = ""
-            return (f"Received: {s}", {"received": s})
-        except Exception:
-            pass
+    if not pl:
+        return short_payload(0, 1)
 
-    bitfield = int.from_bytes(pl[0], byteorder="big")
+    bitfield = pl[0]
 
-    result = f"Reset navigation filter: (bitfield=0x{bitfield:08X})"
-    result += f"  reset_pvt: {((bitfield >> 1) & 1):2d}"
-    result += f"  reset_ambrtk: {((bitfield >> 0) & 1):2d}"
+    result = (
+        f"Reset navigation filter: (bitfield=0x{bitfield:08X})\n"
+        f"  reset_pvt: {((bitfield >> 1) & 1):2d}\n"
+        f"  reset_ambrtk: {((bitfield >> 0) & 1):2d}"
+    )
 
     return (
         result,
@@ -60,14 +57,14 @@ def set_reset_navigation_filter(
     no_decode: bool = typer.Option(False, help="Do not decode frames; just dump hex"),
     # User-friendly payload options
     reset_pvt: bool = typer.Option(
-        None,
+        False,
         "--reset_pvt",
         "-rp",
         help="Reset the whole PVT filter, including RTK ambiguities and INS/GNSS filter",
         is_flag=True,
     ),
     reset_ambrtk: bool = typer.Option(
-        None,
+        False,
         "--reset_ambrtk",
         "-ra",
         help="Reset only the ambiguities used in RTK positioning to float status",
@@ -88,63 +85,27 @@ def set_reset_navigation_filter(
         orbfix cmd reset-navigation-filter set --reset_ambrtk
     """
 
-    sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
-    from ..common.config import get_default_port
-    from pathlib import Path
-
-    saved = get_default_port()
-    resolved_port = port or (saved if saved and Path(saved).exists() else None)
-    if not resolved_port:
-        import typer as _t
-
-        _t.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise _t.Exit(code=2)
+    sys_id_val = sysid_value(sysid)
 
     # Build payload
     if payload:
         # User provided raw hex payload
         payload_bytes = parse_payload_spec(payload)
-        if len(payload_bytes) != 1:
-            typer.secho(
-                f"Warning: Payload is {len(payload_bytes)} bytes (expected 1 for level bitfield)",
-                fg="yellow",
-            )
+        if len(payload_bytes) != _EXPECTED_LEN:
+            typer.secho(f"Error: Payload is {len(payload_bytes)} bytes (expected {_EXPECTED_LEN} for level bitfield)", fg="red")
+            raise typer.Exit(code=1)
     else:
-        # Initialize bitfield
-        bitfield = int.from_bytes(b"\x00", byteorder="big")
-
-        if reset_pvt is True:
-            bitfield |= 1 << 1
-
-        if reset_ambrtk is True:
-            bitfield |= 1 << 0
-
-        payload_bytes = bitfield.to_bytes(1, "big")
-
-        typer.secho("Reset navigation filter:", fg="cyan", bold=True)
-        typer.secho(
-            f"  reset_pvt: {((bitfield >> 1) & 1):2d}",
-            fg="green",
-        )
-        typer.secho(
-            f"  reset_ambrtk: {((bitfield >> 0) & 1):2d}",
-            fg="green",
+        # Bit 1: reset PVT filter, bit 0: reset RTK ambiguities
+        bitfield = (reset_pvt << 1) | reset_ambrtk
+        payload_bytes = bytes((bitfield,))
+
+        typer.echo(
+            typer.style("Reset navigation filter:", fg="cyan", bold=True) + "\n"
+            + typer.style(
+                f"  reset_pvt: {((bitfield >> 1) & 1):2d}\n"
+                f"  reset_ambrtk: {((bitfield >> 0) & 1):2d}",
+                fg="green",
+            ) + "\n"
         )
-        typer.echo()
-
-    from serial import SerialException
-
-    try:
-        send_and_receive(
-            port=resolved_port,
-            baudrate=baud,
-            read_timeout_s=timeout,
-            overall_wait_s=wait,
-            cmd_id=CMD_ID,
-            sysid=sys_id_val,
-            payload=payload_bytes,
-            decode=(not no_decode),
-        )
-    except SerialException as e:
-        typer.secho(f"Serial error: {e}", fg="red")
-        raise typer.Exit(code=1)
+
+    run_cmd(CMD_ID, sys_id_val, payload_bytes, port=port, baud=baud, timeout=timeout, wait=wait, decode=not no_decode)
@@ -1,15 +1,56 @@
 from __future__ import annotations
 import typer
-from ..common.io_utils import parse_one_byte_spec, parse_payload_spec
-from ..transport.serial_rs422 import find_usb_device, DEFAULT_BAUD, DEFAULT_READ_TIMEOUT_S
-from .base import send_and_receive, DEFAULT_OVERALL_WAIT_S
-from .parsers import register
+from ..common.io_utils import is_printable_ascii, parse_payload_spec
+from .base import run_cmd, PORT_OPTION, BAUD_OPTION, TIMEOUT_OPTION, WAIT_OPTION, NO_DECODE_OPTION, sysid_value
+from .parsers import register, short_payload
 
 app = typer.Typer(help="Get or set the SBAS correction details in the PVT computation.")
 
 CMD_ID = 0x0014
 DEFAULT_SYSID = "0x6A"
 
+# Satellite mapping
+_SATELLITE_MAP = {
+    0x00: "Auto",
+    0x01: "EGNOS",
+    0x02: "WAAS",
+    0x03: "MSAS",
+    0x04: "GAGAN",
+    0x05: "SDCM",
+    0x06: "S120",
+    # 0x07-0x2C: Reserved
+    0x2D: "S158",
+}
+_SATELLITE_TO_BYTE = {name.lower(): byte for byte, name in _SATELLITE_MAP.items()}
+
+# SISMode mapping
+_SIS_MODE_MAP = {
+    0x00: "Test",
+    0x01: "Operational",
+}
+_SIS_MODE_TO_BYTE = {name.lower(): byte for byte, name in _SIS_MODE_MAP.items()}
+
+# NavMode mapping
+_NAV_MODE_MAP = {
+    0x00: "EnRoute",
+    0x01: "PrecApp",
+    0x02: "MixedSystems",
+}
+_NAV_MODE_TO_BYTE = {name.lower(): byte for byte, name in _NAV_MODE_MAP.items()}
+
+# DO229Version mapping
+_DO229_VERSION_MAP = {
+    0x00: "Auto",
+    0x01: "DO229C",
+}
+_DO229_VERSION_TO_BYTE = {name.lower(): byte for byte, name in _DO229_VERSION_MAP.items()}
+
+# Display name for every possible byte, unknown values included
+_SATELLITE_DISPLAY = [_SATELLITE_MAP.get(i, f"Unknown(0x{i:02X})") for i in range(256)]
+_SIS_MODE_DISPLAY = [_SIS_MODE_MAP.get(i, f"Unknown(0x{i:02X})") for i in range(256)]
+_NAV_MODE_DISPLAY = [_NAV_MODE_MAP.get(i, f"Unknown(0x{i:02X})") for i in range(256)]
+_DO229_VERSION_DISPLAY = [_DO229_VERSION_MAP.get(i, f"Unknown(0x{i:02X})") for i in range(256)]
+
 # Parser for responses to this command
 @register(CMD_ID)
 def _parse_sbas_corrections(decoded):
@@ -24,54 +65,21 @@ def _parse_sbas_corrections(decoded):
     pl: bytes = getattr(decoded, "payload", b"") or b""
 
     if len(pl) < 4:
-        try:
-            s = pl.rstrip(b"\x00").decode("utf-8")
-            if s and all(31 < ord(ch) < 127 or ch in "\r\n\t ._:-/()" for ch in s):
-                return (f"Received: {s}", {"received": s})
-        except Exception:
-            pass
+        stripped = pl.rstrip(b"\x00")
+        if is_printable_ascii(stripped):
+            s = stripped.decode("ascii")
+            return (f"Received: {s}", {"received": s})
+        return short_payload(len(pl), 4)
 
     satellite = pl[0]
     sis_mode = pl[1]
     nav_mode = pl[2]
     do229_version = pl[3]
 
-    # Satellite mapping
-    satellite_map = {
-        0x00: "Auto",
-        0x01: "EGNOS",
-        0x02: "WAAS",
-        0x03: "MSAS",
-        0x04: "GAGAN",
-        0x05: "SDCM",
-        0x06: "S120",
-        # 0x07-0x2C: Reserved
-        0x2D: "S158",
-    }
-
-    # SISMode mapping
-    sis_mode_map = {
-        0x00: "Test",
-        0x01: "Operational",
-    }
-
-    # NavMode mapping
-    nav_mode_map = {
-        0x00: "EnRoute",
-        0x01: "PrecApp",
-        0x02: "MixedSystems",
-    }
-
-    # DO229Version mapping
-    do229_version_map = {
-        0x00: "Auto",
-        0x01: "DO229C",
-    }
-
-    satellite_str = satellite_map.get(satellite, f"Unknown(0x{satellite:02X})")
-    sis_mode_str = sis_mode_map.get(sis_mode, f"Unknown(0x{sis_mode:02X})")
-    nav_mode_str = nav_mode_map.get(nav_mode, f"Unknown(0x{nav_mode:02X})")
-    do229_str = do229_version_map.get(do229_version, f"Unknown(0x{do229_version:02X})")
+    satellite_str = _SATELLITE_DISPLAY[satellite]
+    sis_mode_str = _SIS_MODE_DISPLAY[sis_mode]
+    nav_mode_str = _NAV_MODE_DISPLAY[nav_mode]
+    do229_str = _DO229_VERSION_DISPLAY[do229_version]
 
     result = "SBAS Corrections:\n"
     result += f"  Satellite: {satellite_str}\n"
@@ -96,11 +104,11 @@ def _parse_sbas_corrections(decoded):
 @app.command("set")
 def set_sbas_corrections(
     sysid: str = typer.Option(DEFAULT_SYSID, "--sysid", "--subsys", help="System/Subsys ID (1 byte)"),
-    port: str | None = typer.Option(None, help="Explicit serial port path"),
-    baud: int = typer.Option(DEFAULT_BAUD, help="Baud rate"),
-    timeout: float = typer.Option(DEFAULT_READ_TIMEOUT_S, help="Per-read timeout (s)"),
-    wait: float = typer.Option(DEFAULT_OVERALL_WAIT_S, help="Overall receive window (s)"),
-    no_decode: bool = typer.Option(False, help="Do not decode frames; just dump hex"),
+    port: str | None = PORT_OPTION,
+    baud: int = BAUD_OPTION,
+    timeout: float = TIMEOUT_OPTION,
+    wait: float = WAIT_OPTION,
+    no_decode: bool = NO_DECODE_OPTION,
     # User-friendly options
     satellite: str = typer.Option(None, "--satellite", "-s", help="Satellite: auto, egnos, waas, msas, gagan, sdcm, s120, s158"),
     sis_mode: str = typer.Option(None, "--sis-mode", help="SIS Mode: test, operational"),
@@ -121,18 +129,7 @@ def set_sbas_corrections(
     # Raw payload
       orbfix cmd sbas-corrections set --payload 01000100
     """
-    sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
-    from ..common.config import get_default_port
-    from pathlib import Path
-    saved = get_default_port()
-    resolved_port = (
-        port
-        or (saved if saved and Path(saved).exists() else None)
-    )
-    if not resolved_port:
-        import typer as _t
-        _t.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise _t.Exit(code=2)
+    sys_id_val = sysid_value(sysid)
 
     # Build payload
     if payload:
@@ -145,131 +142,63 @@ def set_sbas_corrections(
             typer.secho("Error: All parameters required: --satellite, --sis-mode, --nav-mode, --do229", fg="red")
             raise typer.Exit(code=1)
 
-        # Satellite mapping
-        satellite_map = {
-            "auto": 0x00,
-            "egnos": 0x01,
-            "waas": 0x02,
-            "msas": 0x03,
-            "gagan": 0x04,
-            "sdcm": 0x05,
-            "s120": 0x06,
-            "s158": 0x2D,
-        }
-
-        # SISMode mapping
-        sis_mode_map = {
-            "test": 0x00,
-            "operational": 0x01,
-        }
-
-        # NavMode mapping
-        nav_mode_map = {
-            "enroute": 0x00,
-            "precapp": 0x01,
-            "mixedsystems": 0x02,
-        }
-
-        # DO229Version mapping
-        do229_version_map = {
-            "auto": 0x00,
-            "do229c": 0x01,
-        }
-
         # Parse and validate
         sat_lower = satellite.lower()
-        if sat_lower not in satellite_map:
+        if sat_lower not in _SATELLITE_TO_BYTE:
             typer.secho(f"Error: Unknown satellite '{satellite}'", fg="red")
-            typer.secho(f"Valid values: {', '.join(satellite_map.keys())}", fg="yellow")
+            typer.secho(f"Valid values: {', '.join(_SATELLITE_TO_BYTE)}", fg="yellow")
             raise typer.Exit(code=1)
-        satellite_byte = satellite_map[sat_lower]
+        satellite_byte = _SATELLITE_TO_BYTE[sat_lower]
 
         sis_lower = sis_mode.lower()
-        if sis_lower not in sis_mode_map:
+        if sis_lower not in _SIS_MODE_TO_BYTE:
             typer.secho(f"Error: Unknown SIS mode '{sis_mode}'", fg="red")
-            typer.secho(f"Valid values: {', '.join(sis_mode_map.keys())}", fg="yellow")
+            typer.secho(f"Valid values: {', '.join(_SIS_MODE_TO_BYTE)}", fg="yellow")
             raise typer.Exit(code=1)
-        sis_mode_byte = sis_mode_map[sis_lower]
+        sis_mode_byte = _SIS_MODE_TO_BYTE[sis_lower]
 
         nav_lower = nav_mode.lower()
-        if nav_lower not in nav_mode_map:
+        if nav_lower not in _NAV_MODE_TO_BYTE:
             typer.secho(f"Error: Unknown nav mode '{nav_mode}'", fg="red")
-            typer.secho(f"Valid values: {', '.join(nav_mode_map.keys())}", fg="yellow")
+            typer.secho(f"Valid values: {', '.join(_NAV_MODE_TO_BYTE)}", fg="yellow")
             raise typer.Exit(code=1)
-        nav_mode_byte = nav_mode_map[nav_lower]
+        nav_mode_byte = _NAV_MODE_TO_BYTE[nav_lower]
 
         do229_lower = do229_version.lower()
-        if do229_lower not in do229_version_map:
+        if do229_lower not in _DO229_VERSION_TO_BYTE:
             typer.secho(f"Error: Unknown DO-229 version '{do229_version}'", fg="red")
-            typer.secho(f"Valid values: {', '.join(do229_version_map.keys())}", fg="yellow")
+            typer.secho(f"Valid values: {', '.join(_DO229_VERSION_TO_BYTE)}", fg="yellow")
             raise typer.Exit(code=1)
-        do229_byte = do229_version_map[do229_lower]
+        do229_byte = _DO229_VERSION_TO_BYTE[do229_lower]
 
         payload_bytes = bytes([satellite_byte, sis_mode_byte, nav_mode_byte, do229_byte])
 
         # Show configuration
-        typer.secho("\nSBAS Corrections Configuration:", fg="cyan", bold=True)
-        typer.secho(f"  Satellite: {satellite}", fg="green")
-        typer.secho(f"  SIS Mode: {sis_mode}", fg="green")
-        typer.secho(f"  Nav Mode: {nav_mode}", fg="green")
-        typer.secho(f"  DO-229 Version: {do229_version}", fg="green")
-        typer.echo()
-
-    from serial import SerialException
-    try:
-        send_and_receive(
-            port=resolved_port,
-            baudrate=baud,
-            read_timeout_s=timeout,
-            overall_wait_s=wait,
-            cmd_id=CMD_ID,
-            sysid=sys_id_val,
-            payload=payload_bytes,
-            decode=(not no_decode),
+        typer.echo(
+            typer.style("\nSBAS Corrections Configuration:", fg="cyan", bold=True) + "\n"
+            + typer.style(
+                f"  Satellite: {satellite}\n"
+                f"  SIS Mode: {sis_mode}\n"
+                f"  Nav Mode: {nav_mode}\n"
+                f"  DO-229 Version: {do229_version}",
+                fg="green",
+            ) + "\n"
         )
-    except SerialException as e:
-        typer.secho(f"Serial error: {e}", fg="red")
-        raise typer.Exit(code=1)
+
+    run_cmd(CMD_ID, sys_id_val, payload_bytes, port=port, baud=baud, timeout=timeout, wait=wait, decode=not no_decode)
 
 
 @app.command("get")
 def get_sbas_corrections(
     sysid: str = typer.Option(DEFAULT_SYSID, "--sysid", "--subsys", help="System/Subsys ID (1 byte)"),
-    port: str | None = typer.Option(None, help="Explicit serial port path"),
-    baud: int = typer.Option(DEFAULT_BAUD, help="Baud rate"),
-    timeout: float = typer.Option(DEFAULT_READ_TIMEOUT_S, help="Per-read timeout (s)"),
-    wait: float = typer.Option(DEFAULT_OVERALL_WAIT_S, help="Overall receive window (s)"),
-    no_decode: bool = typer.Option(False, help="Do not decode frames; just dump hex"),
+    port: str | None = PORT_OPTION,
+    baud: int = BAUD_OPTION,
+    timeout: float = TIMEOUT_OPTION,
+    wait: float = WAIT_OPTION,
+    no_decode: bool = NO_DECODE_OPTION,
 ):
     """Get current SBAS corrections configuration."""
-    sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
-    from ..common.config import get_default_port
-    from pathlib import Path
-    saved = get_default_port()
-    resolved_port = (
-        port
-        or (saved if saved and Path(saved).exists() else None)
-    )
-    if not resolved_port:
-        import typer as _t
-        _t.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise _t.Exit(code=2)
+    sys_id_val = sysid_value(sysid)
 
-    # Empty payload for GET
-    payload_bytes = b""
-
-    from serial import SerialException
-    try:
-        send_and_receive(
-            port=resolved_port,
-            baudrate=baud,
-            read_timeout_s=timeout,
-            overall_wait_s=wait,
-            cmd_id=CMD_ID,
-            sysid=sys_id_val,
-            payload=payload_bytes,
-            decode=(not no_decode),
-        )
-    except SerialException as e:
-        typer.secho(f"Serial error: {e}", fg="red")
-        raise typer.Exit(code=1)
+    # GET carries no payload
+    run_cmd(CMD_ID, sys_id_val, b"", port=port, baud=baud, timeout=timeout, wait=wait, decode=not no_decode)
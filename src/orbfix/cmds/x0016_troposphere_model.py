@@ -1,15 +1,33 @@
 from __future__ import annotations
 import typer
-from ..common.io_utils import parse_one_byte_spec, parse_payload_spec
-from ..transport.serial_rs422 import find_usb_device, DEFAULT_BAUD, DEFAULT_READ_TIMEOUT_S
-from .base import send_and_receive, DEFAULT_OVERALL_WAIT_S
-from .parsers import register
+from ..common.io_utils import is_printable_ascii, parse_payload_spec
+from .base import run_cmd, PORT_OPTION, BAUD_OPTION, TIMEOUT_OPTION, WAIT_OPTION, NO_DECODE_OPTION, sysid_value
+from .parsers import register, short_payload
 
 app = typer.Typer(help="Get or set the troposphere model.")
 
 CMD_ID = 0x0016
 DEFAULT_SYSID = "0x6A"
 
+# Zenith Model mapping
+_ZENITH_MAP = {
+    0x00: "Off",
+    0x01: "Saastamoinen",
+    0x02: "MOPS",
+}
+_ZENITH_TO_BYTE = {name.lower(): byte for byte, name in _ZENITH_MAP.items()}
+
+# Mapping Model mapping
+_MAPPING_MAP = {
+    0x00: "Niell",
+    0x01: "MOPS",
+}
+_MAPPING_TO_BYTE = {name.lower(): byte for byte, name in _MAPPING_MAP.items()}
+
+# Display name for every possible byte, unknown values included
+_ZENITH_DISPLAY = [_ZENITH_MAP.get(i, f"Unknown(0x{i:02X})") for i in range(256)]
+_MAPPING_DISPLAY = [_MAPPING_MAP.get(i, f"Unknown(0x{i:02X})") for i in range(256)]
+
 # Parser for responses to this command
 @register(CMD_ID)
 def _parse_troposphere_model(decoded):
@@ -21,32 +39,18 @@ def _parse_troposphere_model(decoded):
     """
     pl: bytes = getattr(decoded, "payload", b"") or b""
 
-    if len(pl) < 1:
-        try:
-            s = pl.rstrip(b"\x00").decode("utf-8")
-            if s and all(31 < ord(ch) < 127 or ch in "\r\n\t ._:-/()" for ch in s):
-                return (f"Received: {s}", {"received": s})
-        except Exception:
-            pass
+    if len(pl) < 2:
+        stripped = pl.rstrip(b"\x00")
+        if is_printable_ascii(stripped):
+            s = stripped.decode("ascii")
+            return (f"Received: {s}", {"received": s})
+        return short_payload(len(pl), 2)
 
     zenith = pl[0]
     mapping = pl[1]
 
-    # Zenith Model mapping
-    zenith_map = {
-        0x00: "Off",
-        0x01: "Saastamoinen",
-        0x02: "MOPS",
-    }
-
-    # Mapping Model mapping
-    mapping_map = {
-        0x00: "Niell",
-        0x01: "MOPS",
-    }
-
-    zenith_str = zenith_map.get(zenith, f"Unknown(0x{zenith:02X})")
-    mapping_str = mapping_map.get(mapping, f"Unknown(0x{mapping:02X})")
+    zenith_str = _ZENITH_DISPLAY[zenith]
+    mapping_str = _MAPPING_DISPLAY[mapping]
 
     result = "Troposphere Model:\n"
     result += f"  Zenith Model: {zenith_str}\n"
@@ -65,11 +69,11 @@ def _parse_troposphere_model(decoded):
 @app.command("set")
 def set_troposphere_model(
     sysid: str = typer.Option(DEFAULT_SYSID, "--sysid", "--subsys", help="System/Subsys ID (1 byte)"),
-    port: str | None = typer.Option(None, help="Explicit serial port path"),
-    baud: int = typer.Option(DEFAULT_BAUD, help="Baud rate"),
-    timeout: float = typer.Option(DEFAULT_READ_TIMEOUT_S, help="Per-read timeout (s)"),
-    wait: float = typer.Option(DEFAULT_OVERALL_WAIT_S, help="Overall receive window (s)"),
-    no_decode: bool = typer.Option(False, help="Do not decode frames; just dump hex"),
+    port: str | None = PORT_OPTION,
+    baud: int = BAUD_OPTION,
+    timeout: float = TIMEOUT_OPTION,
+    wait: float = WAIT_OPTION,
+    no_decode: bool = NO_DECODE_OPTION,
     # User-friendly options
     zenith: str = typer.Option(None, "--zenith-model", "-z", help="Zenith Model: off, saastamoinen, mops"),
     mapping: str = typer.Option(None, "--mapping-model", "-m", help="Mapping Model: niell, mops"),
@@ -85,18 +89,7 @@ def set_troposphere_model(
     # Raw payload
       orbfix cmd troposphere-model set --payload 0101
     """
-    sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
-    from ..common.config import get_default_port
-    from pathlib import Path
-    saved = get_default_port()
-    resolved_port = (
-        port
-        or (saved if saved and Path(saved).exists() else None)
-    )
-    if not resolved_port:
-        import typer as _t
-        _t.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise _t.Exit(code=2)
+    sys_id_val = sysid_value(sysid)
 
     # Build payload
     if payload:
@@ -109,97 +102,47 @@ def set_troposphere_model(
             typer.secho("Error: All parameters required: --zenith-model --mapping-model", fg="red")
             raise typer.Exit(code=1)
 
-        # Zenith Model mapping
-        zenith_map = {
-            "off": 0x00,
-            "saastamoinen": 0x01,
-            "mops": 0x02,
-        }
-
-        # Mapping
-        mapping_map = {
-            "niell": 0x00,
-            "mops": 0x01,
-        }
-
         # Parse and validate
         zenith_lower = zenith.lower()
-        if zenith_lower not in zenith_map:
+        if zenith_lower not in _ZENITH_TO_BYTE:
             typer.secho(f"Error: Unknown satellite '{zenith}'", fg="red")
-            typer.secho(f"Valid values: {', '.join(zenith_map.keys())}", fg="yellow")
+            typer.secho(f"Valid values: {', '.join(_ZENITH_TO_BYTE)}", fg="yellow")
             raise typer.Exit(code=1)
-        zenith_byte = zenith_map[zenith_lower]
+        zenith_byte = _ZENITH_TO_BYTE[zenith_lower]
 
         mapping_lower = mapping.lower()
-        if mapping_lower not in mapping_map:
+        if mapping_lower not in _MAPPING_TO_BYTE:
             typer.secho(f"Error: Unknown satellite '{mapping}'", fg="red")
-            typer.secho(f"Valid values: {', '.join(mapping_map.keys())}", fg="yellow")
+            typer.secho(f"Valid values: {', '.join(_MAPPING_TO_BYTE)}", fg="yellow")
             raise typer.Exit(code=1)
-        mapping_byte = mapping_map[mapping_lower]
+        mapping_byte = _MAPPING_TO_BYTE[mapping_lower]
 
         payload_bytes = bytes([zenith_byte, mapping_byte])
 
         # Show configuration
-        typer.secho("\nTroposphere Model Configuration:", fg="cyan", bold=True)
-        typer.secho(f"  Zenith Model: {zenith}", fg="green")
-        typer.secho(f"  Mapping: {mapping}", fg="green")
-        typer.echo()
-
-    from serial import SerialException
-    try:
-        send_and_receive(
-            port=resolved_port,
-            baudrate=baud,
-            read_timeout_s=timeout,
-            overall_wait_s=wait,
-            cmd_id=CMD_ID,
-            sysid=sys_id_val,
-            payload=payload_bytes,
-            decode=(not no_decode),
+        typer.echo(
+            typer.style("\nTroposphere Model Configuration:", fg="cyan", bold=True) + "\n"
+            + typer.style(
+                f"  Zenith Model: {zenith}\n"
+                f"  Mapping: {mapping}",
+                fg="green",
+            ) + "\n"
         )
-    except SerialException as e:
-        typer.secho(f"Serial error: {e}", fg="red")
-        raise typer.Exit(code=1)
+
+    run_cmd(CMD_ID, sys_id_val, payload_bytes, port=port, baud=baud, timeout=timeout, wait=wait, decode=not no_decode)
 
 
 @app.command("get")
 def get_troposphere_model(
     sysid: str = typer.Option(DEFAULT_SYSID, "--sysid", "--subsys", help="System/Subsys ID (1 byte)"),
-    port: str | None = typer.Option(None, help="Explicit serial port path"),
-    baud: int = typer.Option(DEFAULT_BAUD, help="Baud rate"),
-    timeout: float = typer.Option(DEFAULT_READ_TIMEOUT_S, help="Per-read timeout (s)"),
-    wait: float = typer.Option(DEFAULT_OVERALL_WAIT_S, help="Overall receive window (s)"),
-    no_decode: bool = typer.Option(False, help="Do not decode frames; just dump hex"),
+    port: str | None = PORT_OPTION,
+    baud: int = BAUD_OPTION,
+    timeout: float = TIMEOUT_OPTION,
+    wait: float = WAIT_OPTION,
+    no_decode: bool = NO_DECODE_OPTION,
 ):
     """Get current Troposphere Model configuration."""
-    sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
-    from ..common.config import get_default_port
-    from pathlib import Path
-    saved = get_default_port()
-    resolved_port = (
-        port
-        or (saved if saved and Path(saved).exists() else None)
-    )
-    if not resolved_port:
-        import typer as _t
-        _t.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise _t.Exit(code=2)
-
-    # Empty payload for GET
-    payload_bytes = b""
-
-    from serial import SerialException
-    try:
-        send_and_receive(
-            port=resolved_port,
-            baudrate=baud,
-            read_timeout_s=timeout,
-            overall_wait_s=wait,
-            cmd_id=CMD_ID,
-            sysid=sys_id_val,
-            payload=payload_bytes,
-            decode=(not no_decode),
-        )
-    except SerialException as e:
-        typer.secho(f"Serial error: {e}", fg="red")
-        raise typer.Exit(code=1)
+    sys_id_val = sysid_value(sysid)
+
+    # GET carries no payload
+    run_cmd(CMD_ID, sys_id_val, b"", port=port, baud=baud, timeout=timeout, wait=wait, decode=not no_decode)
@@ -1,15 +1,42 @@
 from __future__ import annotations
+import struct
 import typer
-from ..common.io_utils import parse_one_byte_spec, parse_payload_spec
-from ..transport.serial_rs422 import find_usb_device, DEFAULT_BAUD, DEFAULT_READ_TIMEOUT_S
-from .base import send_and_receive, DEFAULT_OVERALL_WAIT_S
-from .parsers import register
+from ..common.io_utils import is_printable_ascii, parse_payload_spec
+from ..transport.serial_rs422 import DEFAULT_BAUD, DEFAULT_READ_TIMEOUT_S
+from .base import run_cmd, DEFAULT_OVERALL_WAIT_S, sysid_value
+from .parsers import register, short_payload
 
 app = typer.Typer(help="Get or set the clock sync threshold.")
 
 CMD_ID = 0x0017
 DEFAULT_SYSID = "0x6A"
 
+# Threshold (U1), StartupSync (U1)
+_CLOCK_SYNC_STRUCT = struct.Struct(">BB")
+
+# Threshold mapping
+_THRESHOLD_MAP = {
+    0x00: "ClockSteering",
+    0x01: "usec500",
+    0x02: "msec1",
+    0x03: "msec2",
+    0x04: "msec3",
+    0x05: "msec4",
+    0x06: "msec5",
+}
+_THRESHOLD_TO_BYTE = {name.lower(): byte for byte, name in _THRESHOLD_MAP.items()}
+
+# StartupSync mapping
+_STARTUP_MAP = {
+    0x00: "off",
+    0x01: "on",
+}
+_STARTUP_TO_BYTE = {name.lower(): byte for byte, name in _STARTUP_MAP.items()}
+
+# Display name for every possible byte, unknown values included
+_THRESHOLD_DISPLAY = [_THRESHOLD_MAP.get(i, f"Unknown(0x{i:02X})") for i in range(256)]
+_STARTUP_DISPLAY = [_STARTUP_MAP.get(i, f"Unknown(0x{i:02X})") for i in range(256)]
+
 # Parser for responses to this command
 @register(CMD_ID)
 def _parse_clock_sync(decoded):
@@ -22,38 +49,23 @@ def _parse_clock_sync(decoded):
     pl: bytes = getattr(decoded, "payload", b"") or b""
 
     if len(pl) < 2:
-        try:
-            s = pl.rstrip(b"\x00").decode("utf-8")
-            if s and all(31 < ord(ch) < 127 or ch in "\r\n\t ._:-/()" for ch in s):
-                return (f"Received: {s}", {"received": s})
-        except Exception:
-            pass
+        stripped = pl.rstrip(b"\x00")
+        if is_printable_ascii(stripped):
+            s = stripped.decode("ascii")
+            return (f"Received: {s}", {"received": s})
+        return short_payload(len(pl), 2)
 
     threshold = pl[0]
     startupSync = pl[1]
 
-    # Satellite mapping
-    threshold_map = {
-        0x00: "ClockSteering",
-        0x01: "usec500",
-        0x02: "msec1",
-        0x03: "msec2",
-        0x04: "msec3",
-        0x05: "msec4",
-        0x06: "msec5",
-    }
-
-    startup_map = {
-        0x00: "off",
-        0x01: "on"
-    }
-
-    threshold_str = threshold_map.get(threshold, f"Unknown(0x{threshold:02X})")
-    startup_str = startup_map.get(startupSync,f"Unknown(0x{startupSync:02X})")
-
-    result = "Clock Sync Threshold:\n"
-    result += f"  Threshold: {threshold_str}\n"
-    result += f"  StartupSync: {startup_str}\n"
+    threshold_str = _THRESHOLD_DISPLAY[threshold]
+    startup_str = _STARTUP_DISPLAY[startupSync]
+
+    result = (
+        "Clock Sync Threshold:\n"
+        f"  Threshold: {threshold_str}\n"
+        f"  StartupSync: {startup_str}\n"
+    )
     return (
         result,
         {
@@ -87,83 +99,44 @@ def set_clock_sync_threshold(
     # Raw payload
       orbfix cmd clock-sync-threshold set --payload 0101
     """
-    sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
-    from ..common.config import get_default_port
-    from pathlib import Path
-    saved = get_default_port()
-    resolved_port = (
-        port
-        or (saved if saved and Path(saved).exists() else None)
-    )
-    if not resolved_port:
-        import typer as _t
-        _t.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise _t.Exit(code=2)
+    sys_id_val = sysid_value(sysid)
 
     # Build payload
     if payload:
         payload_bytes = parse_payload_spec(payload)
-        if len(payload_bytes) != 2:
-            typer.secho(f"Warning: Payload is {len(payload_bytes)} bytes (expected 2)", fg="yellow")
+        if len(payload_bytes) != _CLOCK_SYNC_STRUCT.size:
+            typer.secho(f"Warning: Payload is {len(payload_bytes)} bytes (expected {_CLOCK_SYNC_STRUCT.size})", fg="yellow")
     else:
         # All parameters required for SET
-        if not all([threshold, startupSync]):
+        if not (threshold and startupSync):
             typer.secho("Error: All parameters required: --threshold --startupsync", fg="red")
             raise typer.Exit(code=1)
 
-        # System mapping
-        threshold_map = {
-            "clocksteering": 0x00,
-            "usec500": 0x01,
-            "msec1": 0x02,
-            "msec2": 0x03,
-            "msec3": 0x04,
-            "msec4": 0x05,
-            "msec5": 0x06,
-        }
-        startupSync_map = {
-            "off": 0x00,
-            "on": 0x01
-        }
-
         # Parse and validate
-        threshold_lower = threshold.lower()
-        if threshold_lower not in threshold_map:
+        threshold_byte = _THRESHOLD_TO_BYTE.get(threshold.lower())
+        if threshold_byte is None:
             typer.secho(f"Error: Unknown threshold '{threshold}'", fg="red")
-            typer.secho(f"Valid values: {', '.join(threshold_map.keys())}", fg="yellow")
+            typer.secho(f"Valid values: {', '.join(_THRESHOLD_TO_BYTE)}", fg="yellow")
             raise typer.Exit(code=1)
-        threshold_byte = threshold_map[threshold_lower]
 
-        startupSync_lower = startupSync.lower()
-        if startupSync_lower not in startupSync_map:
+        startup_byte = _STARTUP_TO_BYTE.get(startupSync.lower())
+        if startup_byte is None:
             typer.secho(f"Error: Unknown startup sync '{startupSync}'", fg="red")
-            typer.secho(f"Valid values: {', '.join(startupSync_map.keys())}", fg="yellow")
+            typer.secho(f"Valid values: {', '.join(_STARTUP_TO_BYTE)}", fg="yellow")
             raise typer.Exit(code=1)
-        startup_byte = startupSync_map[startupSync_lower]
 
-        payload_bytes = bytes([threshold_byte, startup_byte])
+        payload_bytes = _CLOCK_SYNC_STRUCT.pack(threshold_byte, startup_byte)
 
         # Show configuration
-        typer.secho("\nClock Sync Threshold Configuration:", fg="cyan", bold=True)
-        typer.secho(f"  Threshold: {threshold}", fg="green")
-        typer.secho(f"  StartupSync: {startupSync}", fg="green")
-        typer.echo()
-
-    from serial import SerialException
-    try:
-        send_and_receive(
-            port=resolved_port,
-            baudrate=baud,
-            read_timeout_s=timeout,
-            overall_wait_s=wait,
-            cmd_id=CMD_ID,
-            sysid=sys_id_val,
-            payload=payload_bytes,
-            decode=(not no_decode),
-        )
-    except SerialException as e:
-        typer.secho(f"Serial error: {e}", fg="red")
-        raise typer.Exit(code=1)
+        lines = [
+            typer.style("\nClock Sync Threshold Configuration:", fg="cyan", bold=True),
+            typer.style(f"  Threshold: {threshold}", fg="green"),
+            typer.style(f"  StartupSync: {startupSync}", fg="green"),
+            "",
+        ]
+        typer.echo("\n".join(lines))
+
+    run_cmd(CMD_ID, sys_id_val, payload_bytes, port=port, baud=baud, timeout=timeout, wait=wait, decode=not no_decode)
 
 
 @app.command("get")
@@ -176,34 +149,7 @@ def get_timing_system(
     no_decode: bool = typer.Option(False, help="Do not decode frames; just dump hex"),
 ):
     """Get current Clock Sync Threshold configuration."""
-    sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
-    from ..common.config import get_default_port
-    from pathlib import Path
-    saved = get_default_port()
-    resolved_port = (
-        port
-        or (saved if saved and Path(saved).exists() else None)
-    )
-    if not resolved_port:
-        import typer as _t
-        _t.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise _t.Exit(code=2)
-
-    # Empty payload for GET
-    payload_bytes = b""
-
-    from serial import SerialException
-    try:
-        send_and_receive(
-            port=resolved_port,
-            baudrate=baud,
-            read_timeout_s=timeout,
-            overall_wait_s=wait,
-            cmd_id=CMD_ID,
-            sysid=sys_id_val,
-            payload=payload_bytes,
-            decode=(not no_decode),
-        )
-    except SerialException as e:
-        typer.secho(f"Serial error: {e}", fg="red")
-        raise typer.Exit(code=1)
+    sys_id_val = sysid_value(sysid)
+
+    # GET carries no payload
+    run_cmd(CMD_ID, sys_id_val, b"", port=port, baud=baud, timeout=timeout, wait=wait, decode=not no_decode)
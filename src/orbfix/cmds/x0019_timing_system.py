@@ -1,15 +1,31 @@
 from __future__ import annotations
+import struct
 import typer
-from ..common.io_utils import parse_one_byte_spec, parse_payload_spec
-from ..transport.serial_rs422 import find_usb_device, DEFAULT_BAUD, DEFAULT_READ_TIMEOUT_S
-from .base import send_and_receive, DEFAULT_OVERALL_WAIT_S
-from .parsers import register
+from ..common.io_utils import is_printable_ascii, parse_payload_spec
+from ..transport.serial_rs422 import DEFAULT_BAUD, DEFAULT_READ_TIMEOUT_S
+from .base import run_cmd, DEFAULT_OVERALL_WAIT_S, sysid_value
+from .parsers import register, short_payload
 
 app = typer.Typer(help="Get or set the reference time system for the computation of the receiver clock bias.")
 
 CMD_ID = 0x0019
 DEFAULT_SYSID = "0x6A"
 
+# System (U1)
+_SYSTEM_STRUCT = struct.Struct(">B")
+
+# System mapping
+_SYSTEM_MAP = {
+    0x00: "Galileo",
+    0x01: "GPS",
+    0x02: "BeiDou",
+    0x03: "auto",
+}
+_SYSTEM_TO_BYTE = {name.lower(): byte for byte, name in _SYSTEM_MAP.items()}
+
+# Display name for every possible byte, unknown values included
+_SYSTEM_DISPLAY = [_SYSTEM_MAP.get(i, f"Unknown(0x{i:02X})") for i in range(256)]
+
 # Parser for responses to this command
 @register(CMD_ID)
 def _parse_timing_system(decoded):
@@ -21,27 +37,20 @@ def _parse_timing_system(decoded):
     pl: bytes = getattr(decoded, "payload", b"") or b""
 
     if len(pl) < 1:
-        try:
-            s = pl.rstrip(b"\x00").decode("utf-8")
-            if s and all(31 < ord(ch) < 127 or ch in "\r\n\t ._:-/()" for ch in s):
-                return (f"Received: {s}", {"received": s})
-        except Exception:
-            pass
+        stripped = pl.rstrip(b"\x00")
+        if is_printable_ascii(stripped):
+            s = stripped.decode("ascii")
+            return (f"Received: {s}", {"received": s})
+        return short_payload(len(pl), 1)
 
     system = pl[0]
 
-    # System mapping
-    system_map = {
-        0x00: "Galileo",
-        0x01: "GPS",
-        0x02: "BeiDou",
-        0x03: "auto",
-    }
+    system_str = _SYSTEM_DISPLAY[system]
 
-    system_str = system_map.get(system, f"Unknown(0x{system:02X})")
-
-    result = "Timing System:\n"
-    result += f"  System: {system_str}\n"
+    result = (
+        "Timing System:\n"
+        f"  System: {system_str}\n"
+    )
 
     return (
         result,
@@ -73,68 +82,37 @@ def set_timing_system(
     # Raw payload
       orbfix cmd timing-system set --payload 01
     """
-    sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
-    from ..common.config import get_default_port
-    from pathlib import Path
-    saved = get_default_port()
-    resolved_port = (
-        port
-        or (saved if saved and Path(saved).exists() else None)
-    )
-    if not resolved_port:
-        import typer as _t
-        _t.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise _t.Exit(code=2)
+    sys_id_val = sysid_value(sysid)
 
     # Build payload
     if payload:
         payload_bytes = parse_payload_spec(payload)
-        if len(payload_bytes) != 1:
-            typer.secho(f"Warning: Payload is {len(payload_bytes)} bytes (expected 1)", fg="yellow")
+        if len(payload_bytes) != _SYSTEM_STRUCT.size:
+            typer.secho(f"Warning: Payload is {len(payload_bytes)} bytes (expected {_SYSTEM_STRUCT.size})", fg="yellow")
     else:
         # All parameters required for SET
-        if not all([system]):
+        if not system:
             typer.secho("Error: All parameters required: --system", fg="red")
             raise typer.Exit(code=1)
 
-        # System mapping
-        system_map = {
-            "galileo": 0x00,
-            "gps": 0x01,
-            "beidou": 0x02,
-            "auto": 0x03,
-        }
-
         # Parse and validate
-        system_lower = system.lower()
-        if system_lower not in system_map:
+        system_byte = _SYSTEM_TO_BYTE.get(system.lower())
+        if system_byte is None:
             typer.secho(f"Error: Unknown system '{system}'", fg="red")
-            typer.secho(f"Valid values: {', '.join(system_map.keys())}", fg="yellow")
+            typer.secho(f"Valid values: {', '.join(_SYSTEM_TO_BYTE)}", fg="yellow")
             raise typer.Exit(code=1)
-        system_byte = system_map[system_lower]
 
-        payload_bytes = bytes([system_byte])
+        payload_bytes = _SYSTEM_STRUCT.pack(system_byte)
 
         # Show configuration
-        typer.secho("\nTiming System Configuration:", fg="cyan", bold=True)
-        typer.secho(f"  System: {system}", fg="green")
-        typer.echo()
-
-    from serial import SerialException
-    try:
-        send_and_receive(
-            port=resolved_port,
-            baudrate=baud,
-            read_timeout_s=timeout,
-            overall_wait_s=wait,
-            cmd_id=CMD_ID,
-            sysid=sys_id_val,
-            payload=payload_bytes,
-            decode=(not no_decode),
-        )
-    except SerialException as e:
-        typer.secho(f"Serial error: {e}", fg="red")
-        raise typer.Exit(code=1)
+        lines = [
+            typer.style("\nTiming System Configuration:", fg="cyan", bold=True),
+            typer.style(f"  System: {system}", fg="green"),
+            "",
+        ]
+        typer.echo("\n".join(lines))
+
+    run_cmd(CMD_ID, sys_id_val, payload_bytes, port=port, baud=baud, timeout=timeout, wait=wait, decode=not no_decode)
 
 
 @app.command("get")
@@ -147,34 +125,7 @@ def get_timing_system(
     no_decode: bool = typer.Option(False, help="Do not decode frames; just dump hex"),
 ):
     """Get current Timing System configuration."""
-    sys_id_val = parse_one_byte_spec(sysid, what="system id") or 0
-    from ..common.config import get_default_port
-    from pathlib import Path
-    saved = get_default_port()
-    resolved_port = (
-        port
-        or (saved if saved and Path(saved).exists() else None)
-    )
-    if not resolved_port:
-        import typer as _t
-        _t.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
-        raise _t.Exit(code=2)
-
-    # Empty payload for GET
-    payload_bytes = b""
-
-    from serial import SerialException
-    try:
-        send_and_receive(
-            port=resolved_port,
-            baudrate=baud,
-            read_timeout_s=timeout,
-            overall_wait_s=wait,
-            cmd_id=CMD_ID,
-            sysid=sys_id_val,
-            payload=payload_bytes,
-            decode=(not no_decode),
-        )
-    except SerialException as e:
-        typer.secho(f"Serial error: {e}", fg="red")
-        raise typer.Exit(code=1)
+    sys_id_val = sysid_value(sysid)
+
+    # GET carries no payload
+    run_cmd(CMD_ID, sys_id_val, b"", port=port, baud=baud, timeout=timeout, wait=wait, decode=not no_decode)
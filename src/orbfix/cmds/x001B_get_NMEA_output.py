@@ -5,8 +5,8 @@ from ..common.io_utils import parse_one_byte_spec, parse_payload_spec
 from ..transport.serial_rs422 import find_usb_device, DEFAULT_BAUD, DEFAULT_READ_TIMEOUT_S
 from .base import send_and_receive, DEFAULT_OVERALL_WAIT_S
 from .parsers import register
-from ..transport.serial_rs422 import open_serial
-import re, codecs
+from ..transport.pool import get_serial
+import codecs
 
 app = typer.Typer(help="Configure NMEA periodic timer.")
 
@@ -17,6 +17,9 @@ DEBUG_MODE = False
 # Module-level endianness for the parser: ">" big-endian (network order), "<" little-endian.
 PVT_ENDIAN = ">"
 
+# Separators allowed inside a 0x-prefixed hex payload
+_DROP_HEX_SEPARATORS = str.maketrans("", "", "_ ")
+
 def _is_nan(x):
     return isinstance(x, float) and math.isnan(x)
 
@@ -32,10 +35,12 @@ def _fmt_num(v, fmt="{:.9f}", na="N/A"):
 
 def parse_cli_payload(s: str) -> bytes:
     s = s.strip()
-    if s.lower().startswith("0x"):
-        return bytes.fromhex(s[2:].replace("_","").replace(" ",""))  # hex -> bytes
-    if re.fullmatch(r"(?:[0-9A-Fa-f]{2}\s*)+", s):
-        return bytes.fromhex("".join(s.split()))                     # spaced hex -> bytes
+    if s[:2].lower() == "0x":
+        return bytes.fromhex(s[2:].translate(_DROP_HEX_SEPARATORS))  # hex -> bytes
+    try:
+        return bytes.fromhex(s)                                      # (spaced) hex -> bytes
+    except ValueError:
+        pass
     if "\\x" in s:
         return codecs.decode(s, "unicode_escape").encode("latin-1")  # \xNN -> bytes
     return s.encode("utf-8")
@@ -91,16 +96,23 @@ def get_NMEA_output(
             decode=(not no_decode),
         )
         if DEBUG_MODE is True:
-            # Reopen the serial port and monitor ASCII NMEA lines until Ctrl+C
+            # Reuse the (pooled) serial port and monitor ASCII NMEA lines until Ctrl+C
             print("Monitoring NMEA (Ctrl+C to stop)...")
             try:
-                with open_serial(resolved_port, baudrate=baud, timeout_s=1.0) as mon:
-                    mon.reset_input_buffer()
-                    while True:
-                        line = mon.readline()
-                        if not line:
-                            continue
-                        print(line.decode("ascii", errors="replace").rstrip())
+                mon = get_serial(resolved_port, baudrate=baud, timeout_s=1.0)
+                mon.reset_input_buffer()
+                # Read whatever has arrived and split it into lines in one pass;
+                # a trailing partial line waits for the next read
+                pending = bytearray()
+                while True:
+                    chunk = mon.read(mon.in_waiting or 1)
+                    if not chunk:
+                        continue
+                    pending += chunk
+                    *lines, rest = pending.split(b"\n")
+                    if lines:
+                        del pending[:len(pending) - len(rest)]
+                        print("\n".join(ln.decode("ascii", errors="replace").rstrip() for ln in lines))
             except KeyboardInterrupt:
                 raise typer.Abort()
     except SerialException as e:
@@ -1,5 +1,6 @@
+import binascii
+import functools
 import struct
-from pycrc.algorithms import Crc
 
 # Constants
 ENCODER_OFFSET = 9  # header size (without EOL)
@@ -8,14 +9,23 @@ RISECommand_SYNC_2 = 0x53  # 'S'
 ORBFIX_CTL_SUBSYSTEM_ID = 0x7A
 # ORBFIX_GNSS can be any of 0x6A, 0x6B or 0x6C
 ORBFIX_GNSS_SUBSYSTEM_IDS = (0x6A, 0x6B, 0x6C)
+_VALID_SUBSYSTEM_IDS = frozenset((ORBFIX_CTL_SUBSYSTEM_ID, *ORBFIX_GNSS_SUBSYSTEM_IDS))
 EOL = 0x0A  # '\n'
 
+# Frame header: sync1, sync2, CRC, subsystem ID, command ID, payload length.
+# The CRC covers the (ID, command, length) part of the header plus the payload.
+_HDR = struct.Struct(">BBHBHH")
+_CRCBUF = struct.Struct(">BHH")
+_U16 = struct.Struct(">H")
+_CRC_OFFSET = 2
+_CRCBUF_OFFSET = 4
+
 
 def compute_crc(command_info: bytes, arg: bytes) -> int:
     """CRC-16/CCITT-FALSE: width=16, poly=0x1021, init=0x0000, xor_out=0x0000, no reflection."""
-    crc16 = Crc(width=16, poly=0x1021, reflect_in=False, xor_in=0x0000,
-                reflect_out=False, xor_out=0x0000)
-    return crc16.bit_by_bit(command_info + arg)
+    # binascii.crc_hqx is this exact CRC (a.k.a. XMODEM) in C; chaining the
+    # running value over both parts avoids concatenating them
+    return binascii.crc_hqx(arg, binascii.crc_hqx(command_info, 0))
 
 
 class RISECommand:
@@ -29,18 +39,21 @@ class RISECommand:
         # Header fields (big-endian)
         self.sync1 = buffer[0]
         self.sync2 = buffer[1]
-        self.crc = struct.unpack(">H", buffer[2:4])[0]
-        self.orbfix_id = buffer[4]
-        self.cmd_id = struct.unpack(">H", buffer[5:7])[0]
-        self.payload_length = struct.unpack(">H", buffer[7:9])[0]
+        self.crc = _U16.unpack_from(buffer, _CRC_OFFSET)[0]
+        self.orbfix_id, self.cmd_id, self.payload_length = _CRCBUF.unpack_from(buffer, _CRCBUF_OFFSET)
 
         expected_len = ENCODER_OFFSET + self.payload_length + 1  # + EOL
         if len(buffer) != expected_len:
             raise ValueError("Length mismatch")
 
-        self.payload = buffer[9:9 + self.payload_length] if self.payload_length else b""
+        # Keep the received frame; the payload is only copied out on first access
+        self.frame = buffer
         self.eol = buffer[-1]
 
+    @functools.cached_property
+    def payload(self) -> bytes:
+        return bytes(self.frame[ENCODER_OFFSET:ENCODER_OFFSET + self.payload_length])
+
     def validate_header(self) -> bool:
         return (self.sync1 == RISECommand_SYNC_1 and
                 self.sync2 == RISECommand_SYNC_2 and
@@ -48,11 +61,13 @@ class RISECommand:
 
     def validate_id(self) -> bool:
         """Accept either the main ORBFIX_CTL_SUBSYSTEM_ID or any ID in ORBFIX_GNSS_SUBSYSTEM_IDS."""
-        return (self.orbfix_id == ORBFIX_CTL_SUBSYSTEM_ID or self.orbfix_id in ORBFIX_GNSS_SUBSYSTEM_IDS)
+        return self.orbfix_id in _VALID_SUBSYSTEM_IDS
 
     def validate_crc(self) -> bool:
-        crc_buff = struct.pack(">BHH", self.orbfix_id, self.cmd_id, self.payload_length)
-        return self.crc == compute_crc(crc_buff, self.payload)
+        # Both CRC inputs are read in place from the received frame
+        view = memoryview(self.frame)
+        return self.crc == compute_crc(view[_CRCBUF_OFFSET:ENCODER_OFFSET],
+                                       view[ENCODER_OFFSET:ENCODER_OFFSET + self.payload_length])
 
 
 def riseprotocol_decode(command_buffer: bytes):
@@ -72,20 +87,16 @@ def riseprotocol_decode(command_buffer: bytes):
 
 def riseprotocol_encode(command_id: int, system: int, payload: bytes) -> bytes:
     """Build a complete frame"""
-    crc_buff = struct.pack(">BHH", system, command_id, len(payload))
-    crc = compute_crc(crc_buff, payload)
-
-    encoded_message = bytearray(ENCODER_OFFSET + len(payload) + 1)
-    encoded_message[:ENCODER_OFFSET] = struct.pack(
-        ">BBHBHH",
-        RISECommand_SYNC_1,
-        RISECommand_SYNC_2,
-        crc,
-        system,
-        command_id,
-        len(payload),
-    )
+    n = len(payload)
+    encoded_message = bytearray(ENCODER_OFFSET + n + 1)
+    # Header with a zero CRC placeholder, patched in once the CRC is known
+    _HDR.pack_into(encoded_message, 0, RISECommand_SYNC_1, RISECommand_SYNC_2, 0, system, command_id, n)
     if payload:
-        encoded_message[9:9 + len(payload)] = payload
+        encoded_message[ENCODER_OFFSET:ENCODER_OFFSET + n] = payload
     encoded_message[-1] = EOL
+
+    view = memoryview(encoded_message)
+    crc = compute_crc(view[_CRCBUF_OFFSET:ENCODER_OFFSET], view[ENCODER_OFFSET:ENCODER_OFFSET + n])
+    view.release()
+    _U16.pack_into(encoded_message, _CRC_OFFSET, crc)
     return bytes(encoded_message)
\ No newline at end of file
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import copy
 import os
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+import typer
+
 # Config location: ~/.orbfix/config.toml  (override with ORBFIX_CONFIG_FILE if needed)
 CONFIG_FILE = Path(os.environ.get("ORBFIX_CONFIG_FILE", Path.home() / ".orbfix" / "config.toml"))
 
@@ -22,15 +25,32 @@ def _ensure_parent() -> None:
     CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
 
 
-def load_config() -> Dict[str, Any]:
-    if CONFIG_FILE.exists():
+# Last parsed config and the file mtime it was parsed at
+_cache: Dict[str, Any] = {"mtime": None, "cfg": None}
+
+
+def _parsed_config() -> Dict[str, Any]:
+    """The cached parse of the config file, re-read when its mtime changes; do not modify."""
+    try:
+        mtime = CONFIG_FILE.stat().st_mtime_ns
+    except OSError:
+        return {}
+    if _cache["mtime"] != mtime:
         with CONFIG_FILE.open("rb") as f:
-            return tomllib.load(f)
-    return {}
+            _cache["cfg"] = tomllib.load(f)
+        _cache["mtime"] = mtime
+    return _cache["cfg"]
+
+
+def load_config() -> Dict[str, Any]:
+    # Callers edit the result before save_config(); keep the cached copy intact
+    return copy.deepcopy(_parsed_config())
 
 
 def save_config(cfg: Dict[str, Any]) -> None:
     _ensure_parent()
+    # A rewrite within the mtime resolution would otherwise look unchanged
+    _cache["mtime"] = None
     if tomli_w:
         with CONFIG_FILE.open("wb") as f:
             tomli_w.dump(cfg, f)
@@ -48,8 +68,8 @@ def save_config(cfg: Dict[str, Any]) -> None:
 
 
 def get_default_port() -> Optional[str]:
-    cfg = load_config()
-    return cfg.get("serial", {}).get("port")
+    # Only reads the port, so the shared parse can be used without a copy
+    return _parsed_config().get("serial", {}).get("port")
 
 
 def set_default_port(port: str) -> None:
@@ -65,3 +85,19 @@ def clear_default_port() -> None:
         if not cfg["serial"]:
             del cfg["serial"]
         save_config(cfg)
+
+
+def _existing_default_port() -> Optional[str]:
+    saved = get_default_port()
+    return saved if saved and Path(saved).exists() else None
+
+
+def resolve_port(port: Optional[str]) -> str:
+    """Return the explicit port, else the saved default if it exists; exit(2) if neither."""
+    if port:
+        return port
+    saved = _existing_default_port()
+    if saved:
+        return saved
+    typer.secho("No valid port. Use --port, --auto, or set a saved port.", fg="red")
+    raise typer.Exit(code=2)
@@ -13,14 +13,27 @@ __all__ = [
     "parse_payload",
     "parse_one_byte_spec",
     "looks_like_hex",
+    "is_printable_ascii",
 ]
 
+# Printable ASCII plus tab, LF and CR
+_PRINTABLE_ASCII = bytes(range(32, 127)) + b"\t\n\r"
+# str.translate table deleting hex digits: a hex string translates to ""
+_DROP_HEX_DIGITS = str.maketrans("", "", "0123456789abcdefABCDEF")
+_DROP_SPACES = str.maketrans("", "", " ")
+_SEPARATORS_RE = re.compile(r"[\s_]+")
+_ONE_BYTE_RE = re.compile(r"0[xX][0-9a-fA-F]+|\d+")
+
 def hexdump(data: bytes) -> str:
-    return " ".join(f"{b:02X}" for b in data)
+    return data.hex(" ").upper()
 
 def looks_like_hex(s: str) -> bool:
-    s_clean = re.sub(r"[\s_]+", "", s).replace("0x", "").replace("0X", "")
-    return bool(s_clean) and all(c in "0123456789abcdefABCDEF" for c in s_clean) and len(s_clean) % 2 == 0
+    s_clean = _SEPARATORS_RE.sub("", s).replace("0x", "").replace("0X", "")
+    return bool(s_clean) and len(s_clean) % 2 == 0 and not s_clean.translate(_DROP_HEX_DIGITS)
+
+def is_printable_ascii(data: bytes) -> bool:
+    """Return True if data is non-empty and holds only printable ASCII or tab/LF/CR."""
+    return bool(data) and not data.translate(None, _PRINTABLE_ASCII)
 
 class PayloadSpecError(ValueError):
     pass
@@ -74,7 +87,7 @@ def parse_payload(spec: Optional[str]) -> bytes:
 def parse_one_byte_spec(spec: Optional[str], what: str = "system id") -> Optional[int]:
     if spec is None or spec == "":
         return None
-    if re.fullmatch(r"0[xX][0-9a-fA-F]+|\d+", spec):
+    if _ONE_BYTE_RE.fullmatch(spec):
         val = int(spec, 0)
         if not (0 <= val <= 0xFF):
             raise PayloadSpecError(f"{what} must be 0..255, got {val}")
@@ -84,14 +97,6 @@ def parse_one_byte_spec(spec: Optional[str], what: str = "system id") -> Optiona
         raise PayloadSpecError(f"{what} must resolve to exactly 1 byte, got {len(raw)} bytes")
     return raw[0]
 
-def _is_hex_string(s: str) -> bool:
-    """Return True if s is a valid even-length hex string (optionally with 0x)."""
-    if s.startswith(("0x", "0X")):
-        s = s[2:]
-    # allow optional spaces between bytes: "0A 0B"
-    s_clean = s.replace(" ", "")
-    return len(s_clean) > 0 and all(c in "0123456789abcdefABCDEF" for c in s_clean) and (len(s_clean) % 2 == 0)
-
 def parse_payload_spec(payload_str: str) -> bytes:
     """Parse payload spec:
        - if payload_str starts with '0x' or is an even-length hex string -> interpret as hex bytes
@@ -100,12 +105,13 @@ def parse_payload_spec(payload_str: str) -> bytes:
     if not payload_str:
         return b""
     s = payload_str.strip()
-    # If user passed "0x01" or "01" or "0A0B" or "0a 0b", handle as hex
-    if s.startswith(("0x", "0X")) or _is_hex_string(s):
-        if s.startswith(("0x", "0X")):
-            s = s[2:]
-        s = s.replace(" ", "")
-        return bytes.fromhex(s)
+    # "0x01", "01", "0A0B", "0a 0b": one bytes.fromhex over the space-stripped digits
+    prefixed = s.startswith(("0x", "0X"))
+    try:
+        return bytes.fromhex((s[2:] if prefixed else s).translate(_DROP_SPACES))
+    except ValueError:
+        if prefixed:
+            raise
     # Otherwise treat as UTF-8 text
     return s.encode("utf-8")
 
@@ -11,10 +11,13 @@ def try_monitor_proxy(
     payload: bytes,
     wait: float,
     decode: bool = True,
+    expected_count: int | None = None,
     sock_path: str = DEFAULT_SOCK,
 ):
     """
     Send a command request to the running monitor via Unix socket and return the JSON reply dict.
+    The monitor collects response frames for `wait` seconds, or replies as soon as
+    `expected_count` frames have arrived when that is given.
     Returns None if the monitor isn't running or on connection error.
     """
     if not os.path.exists(sock_path):
@@ -26,6 +29,7 @@ def try_monitor_proxy(
         "payload_hex": payload.hex(),
         "wait": wait,
         "decode": decode,
+        "expected_count": expected_count,
     }
 
     try:
@@ -34,14 +38,15 @@ def try_monitor_proxy(
             s.connect(sock_path)
             s.sendall(json.dumps(req).encode("utf-8") + b"\n")
             s.settimeout(wait + 1.5)
-            data = b""
+            # Reply is one JSON line; accumulate in place rather than re-copying per chunk
+            data = bytearray()
             while True:
-                chunk = s.recv(4096)
+                chunk = s.recv(65536)
                 if not chunk:
                     break
                 data += chunk
-                if data.endswith(b"\n"):
+                if chunk.endswith(b"\n"):
                     break
-        return json.loads(data.decode("utf-8"))
+        return json.loads(data)
     except Exception:
         return None
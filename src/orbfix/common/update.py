@@ -1,14 +1,17 @@
+import mmap
 import os
 import time
+from collections import deque
 import zlib
 import struct
 import curses
 
 from ..cmds.base import _encode_frame
 from .RISECommand import RISECommand  # to parse returned frames
-from ..transport.serial_rs422 import RiseParser, _fsm_decode_byte
+from ..transport.serial_rs422 import _scan_frames, RISE_MSG_SIZE
 
 FILE_TRANSFER_CMD = 0x0005  # 16-bit command id used for transfer
+VERBOSE_FRAMES = False      # log the full hex of every frame sent
 
 def send_orbfix_zip(
     ser,
@@ -19,6 +22,8 @@ def send_orbfix_zip(
     sys_id_val: int = 0,
     ack_timeout_s: float = 2.5,
     retry_once: bool = True,
+    window: int = 1,
+    max_frame: int = 1024,
 ):
     """
     Send a firmware blob via FILE_TRANSFER_CMD (0x0005) in framed packets.
@@ -26,8 +31,17 @@ def send_orbfix_zip(
       - status=0 for metadata frame 
       - status=1 for data frames
 
+    Data frames are sized to fill max_frame bytes on the wire (header, payload
+    and EOL); the device must accept frames of that size.
+
     After each frame, wait for an ACK frame from the device and proceed only on OK.
     ACK format assumed: [status:u8][code:u16][msg:ascii...] where status==0 => OK.
+
+    With window > 1, up to `window` data frames are kept in flight and ACKs are
+    matched to them in send order (the ACK carries no idx). A frame the device
+    drops without replying shifts every later ACK onto the wrong packet, so the
+    first NAK or timeout means the ACKs can no longer be trusted: the transfer
+    falls back to stop-and-wait and resends every packet from idx 0.
     """
 
     # Resolve firmware path
@@ -43,7 +57,8 @@ def send_orbfix_zip(
     zip_path = os.path.normpath(os.path.abspath(zip_path))
 
     # Logging helper
-    def _log_line(s: str):
+    # (flush=False for per-frame lines; errors and progress lines flush the log)
+    def _log_line(s: str, flush: bool = True):
         with lock:
             try:
                 output_win.addstr(s + "\n")
@@ -52,7 +67,8 @@ def send_orbfix_zip(
                 output_win.addstr(s + "\n")
             output_win.refresh()
             log_file.write(f"{str(s)}\n")
-            log_file.flush()
+            if flush:
+                log_file.flush()
 
     # Parse ACK helper
     def _parse_ack_frame(frame_bytes: bytes):
@@ -80,77 +96,66 @@ def send_orbfix_zip(
         # Anything else is too short to parse
         return (False, -2, "ack too short")
 
+    # Received bytes not yet framed, and frames not yet looked at; both are kept
+    # across _wait_ack calls because with several frames in flight one read can
+    # carry more than one ACK
+    rx = bytearray()
+    pending = deque()
+
     # Read frames until timeout and return first ACK verdict + stats
-    def _wait_ack(timeout_s: float):
-        parser = RiseParser()
+    # (in_order: also return on a NAK, since the next ACK would be credited to the wrong packet)
+    def _wait_ack(timeout_s: float, in_order: bool = False):
         deadline = time.monotonic() + timeout_s
         bytes_seen = 0
         frames_seen = 0
-        while time.monotonic() < deadline:
-            chunk = ser.read(256)
+        while True:
+            while pending:
+                frame = pending.popleft()
+                frames_seen += 1
+                ok, code, msg = _parse_ack_frame(frame)
+                if ok or code in (-2, -3) or (in_order and code >= 0):  # valid or decodable result; return verdict
+                    return (ok, code, msg, frame, {"bytes_seen": bytes_seen, "frames_seen": frames_seen})
+                # If not an ACK format, keep waiting
+            if time.monotonic() >= deadline:
+                break
+            # Take whatever is buffered; when nothing is, read(1) blocks in the
+            # driver until the first byte arrives (or the port timeout expires)
+            chunk = ser.read(ser.in_waiting or 1)
             if not chunk:
-                time.sleep(0.01)
                 continue
             bytes_seen += len(chunk)
-            for ch in chunk:
-                flen = _fsm_decode_byte(parser, ch)
-                if flen > 0:
-                    frame = bytes(parser.buffer[:flen])
-                    frames_seen += 1
-                    ok, code, msg = _parse_ack_frame(frame)
-                    if ok or code in (-2, -3):  # valid or decodable result; return verdict
-                        return (ok, code, msg, frame, {"bytes_seen": bytes_seen, "frames_seen": frames_seen})
-                    # If not an ACK format, keep waiting
+            rx.extend(chunk)
+            pending.extend(_scan_frames(rx))
         return (False, -1, "ack timeout", b"", {"bytes_seen": bytes_seen, "frames_seen": frames_seen})
 
-    # Validate file
-    if not os.path.isfile(zip_path):
-        _log_line(f"[0x0005] ERROR: zip file not found at {zip_path}")
-        return
-
-    try:
-        with open(zip_path, "rb") as f:
-            data = f.read()
-    except OSError as e:
-        _log_line(f"[0x0005] ERROR: could not read zip: {e}")
-        return
-
-    total_size = len(data)
-    if total_size == 0:
-        _log_line(f"[0x0005] ERROR: zip file is empty ({zip_path})")
-        return
-
-    # Compute CRC32
-    crc32_val = zlib.crc32(data) & 0xFFFFFFFF
-    checksum64 = crc32_val
-
-    # Max encoded ~1024
-    MAX_FRAME = 1024
+    # Max encoded frame: max_frame bytes, up to what the protocol allows
     HEADER_AND_TAIL = 9 + 1   # encoder overhead assumption
     PER_PACKET_META = 1 + 2   # status + idx in payload
-    max_chunk = MAX_FRAME - HEADER_AND_TAIL - PER_PACKET_META
+    if max_frame > RISE_MSG_SIZE + 1:
+        _log_line(f"[0x0005] ERROR: frame size {max_frame} exceeds protocol maximum {RISE_MSG_SIZE + 1}")
+        return
+    max_chunk = max_frame - HEADER_AND_TAIL - PER_PACKET_META
     if max_chunk <= 0:
         max_chunk = 512
 
-    total_packets = (total_size + max_chunk - 1) // max_chunk
-    if total_packets > 0xFFFF:
-        _log_line(f"[0x0005] ERROR: too many packets ({total_packets}) for uint16 idx")
-        return
-
-    # Send + ACK helper (drains stale input, sends, then waits for ACK with stats)
-    def _send_wait_ack(info: str, payload: bytes) -> bool:
+    # Send + ACK helper (optionally drains stale input, sends, then waits for ACK with stats).
+    # Draining is only needed where late or unrelated traffic may be queued: before the
+    # first frame and after a failure; otherwise _wait_ack has consumed up to the last ACK.
+    def _send_wait_ack(info: str, payload: bytes, drain: bool = False) -> bool:
         try:
             frame = _encode_frame(FILE_TRANSFER_CMD, sys_id_val, payload)
         except Exception as e:
             _log_line(f"[0x0005] ERROR: _encode_frame failed during {info}: {e}")
             return False
 
-        # Drain stale input before sending
-        try:
-            ser.reset_input_buffer()
-            _ = ser.read(ser.in_waiting or 0)
-        except Exception:
-            pass
+        if drain:
+            try:
+                ser.reset_input_buffer()
+                _ = ser.read(ser.in_waiting or 0)
+            except Exception:
+                pass
+            rx.clear()
+            pending.clear()
 
         try:
             ser.write(frame)
@@ -158,15 +163,17 @@ def send_orbfix_zip(
             _log_line(f"[0x0005] Write error during {info}: {e}")
             return False
 
-        hexstr = " ".join(f"{b:02X}" for b in frame)
-        _log_line(f"→ Sent 0x0005 {info}: {hexstr!r}")
+        if VERBOSE_FRAMES:
+            _log_line(f"→ Sent 0x0005 {info}: {frame.hex(' ').upper()!r}", flush=False)
+        else:
+            _log_line(f"→ Sent 0x0005 {info}", flush=False)
 
         ok, code, msg, _f, stats = _wait_ack(ack_timeout_s)
         if ok:
             if msg:
-                _log_line(f"← ACK {info}: code={code} msg='{msg}' bytes_seen={stats['bytes_seen']} frames_seen={stats['frames_seen']}")
+                _log_line(f"← ACK {info}: code={code} msg='{msg}' bytes_seen={stats['bytes_seen']} frames_seen={stats['frames_seen']}", flush=False)
             else:
-                _log_line(f"← ACK {info}: code={code} bytes_seen={stats['bytes_seen']} frames_seen={stats['frames_seen']}")
+                _log_line(f"← ACK {info}: code={code} bytes_seen={stats['bytes_seen']} frames_seen={stats['frames_seen']}", flush=False)
             return True
 
         # Distinguish silence vs. non-ACK traffic
@@ -178,34 +185,114 @@ def send_orbfix_zip(
             _log_line(f"← NAK {info}: code={code} msg='{msg}' bytes_seen={stats['bytes_seen']} frames_seen={stats['frames_seen']}")
         return False
 
-    # 1) Metadata frame: >BHQQ (status=0, total_packets:u16, checksum64:u64, total_size:u64)
-    meta_payload = struct.pack(">BHQQ", 0, total_packets, checksum64, total_size)
-    if not _send_wait_ack(f"meta packets={total_packets} size={total_size}", meta_payload):
-        return  # fail meta without retry by default
-
-    # 2) Data frames: [status=1][idx:u16][chunk...], ACK per packet
-    sent = 0
-    for idx in range(total_packets):
-        start = idx * max_chunk
-        end = min(start + max_chunk, total_size)
-        chunk = data[start:end]
-        data_payload = struct.pack(">BH", 1, idx) + chunk
-
-        if _send_wait_ack(f"chunk {idx + 1}/{total_packets} sz={len(chunk)}", data_payload):
-            pass
-        else:
-            if retry_once:
-                _log_line(f"[0x0005] retrying packet idx={idx}")
-                if not _send_wait_ack(f"chunk {idx + 1}/{total_packets} RETRY sz={len(chunk)}", data_payload):
-                    _log_line(f"[0x0005] ERROR: packet idx={idx} failed after retry; aborting")
-                    return
-            else:
-                _log_line(f"[0x0005] ERROR: packet idx={idx} failed; aborting")
+    # Validate file
+    if not os.path.isfile(zip_path):
+        _log_line(f"[0x0005] ERROR: zip file not found at {zip_path}")
+        return
+
+    # Map the file rather than reading it: the CRC and the per-packet slices
+    # are taken straight from the page cache (the mapping outlives the fd)
+    try:
+        with open(zip_path, "rb") as f:
+            total_size = os.fstat(f.fileno()).st_size
+            if total_size == 0:
+                _log_line(f"[0x0005] ERROR: zip file is empty ({zip_path})")
                 return
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        _log_line(f"[0x0005] ERROR: could not read zip: {e}")
+        return
+
+    try:
+        # Compute CRC32
+        crc32_val = zlib.crc32(data) & 0xFFFFFFFF
+        checksum64 = crc32_val
+        total_packets = (total_size + max_chunk - 1) // max_chunk
+        if total_packets > 0xFFFF:
+            _log_line(f"[0x0005] ERROR: too many packets ({total_packets}) for uint16 idx")
+            return
+
+        # 1) Metadata frame: >BHQQ (status=0, total_packets:u16, checksum64:u64, total_size:u64)
+        meta_payload = struct.pack(">BHQQ", 0, total_packets, checksum64, total_size)
+        if not _send_wait_ack(f"meta packets={total_packets} size={total_size}", meta_payload, drain=True):
+            return  # fail meta without retry by default
+
+        sent = 0
+
+        def _progress(idx: int, n: int):
+            nonlocal sent
+            sent += n
+            if (idx & 0x1F) == 0 or sent == total_size:
+                pct = 100.0 * sent / total_size if total_size else 100.0
+                _log_line(f"[0x0005] progress {sent}/{total_size} bytes ({pct:.1f}%)")
+
+        # 2a) Windowed data frames: send ahead, consume ACKs in order
+        first_idx = 0
+        if window > 1:
+            inflight = deque()  # (idx, chunk size), oldest first
+            next_idx = 0
+            while next_idx < total_packets or inflight:
+                while next_idx < total_packets and len(inflight) < window:
+                    chunk = data[next_idx * max_chunk:(next_idx + 1) * max_chunk]
+                    try:
+                        ser.write(_encode_frame(FILE_TRANSFER_CMD, sys_id_val, struct.pack(">BH", 1, next_idx) + chunk))
+                    except Exception as e:
+                        _log_line(f"[0x0005] Write error during chunk {next_idx + 1}/{total_packets}: {e}")
+                        break
+                    _log_line(f"→ Sent 0x0005 chunk {next_idx + 1}/{total_packets} sz={len(chunk)}", flush=False)
+                    inflight.append((next_idx, len(chunk)))
+                    next_idx += 1
+                if not inflight:
+                    break
+
+                ok, code, msg, _f, stats = _wait_ack(ack_timeout_s, in_order=True)
+                if not ok:
+                    _log_line(f"← NAK/TIMEOUT chunk {inflight[0][0] + 1}/{total_packets}: code={code} msg='{msg}' "
+                              f"bytes_seen={stats['bytes_seen']} frames_seen={stats['frames_seen']}")
+                    break
+                idx, n = inflight.popleft()
+                _progress(idx, n)
+
+            if inflight:
+                # The device still answers the frames sent behind the failed one; take those
+                # replies here so the drain below discards them instead of a resent packet
+                # being credited with one of them
+                for _ in range(len(inflight) - 1):
+                    if _wait_ack(ack_timeout_s, in_order=True)[1] == -1:
+                        break
+
+                # ACKs are matched by order only: after a NAK or timeout an earlier packet
+                # may have been dropped and its successor's ACK credited to it, so none of
+                # the windowed ACKs prove delivery. Resend everything.
+                _log_line("[0x0005] lost ACK sync; falling back to stop-and-wait from packet idx=0")
+                first_idx = 0
+                sent = 0
+            else:
+                first_idx = next_idx
+
+        # 2b) Data frames: [status=1][idx:u16][chunk...], ACK per packet
+        for idx in range(first_idx, total_packets):
+            start = idx * max_chunk
+            end = min(start + max_chunk, total_size)
+            chunk = data[start:end]
+            data_payload = struct.pack(">BH", 1, idx) + chunk
+
+            # Resend after the windowed phase gave up from a clean input buffer
+            resync = window > 1 and idx == first_idx
+            if _send_wait_ack(f"chunk {idx + 1}/{total_packets} sz={len(chunk)}", data_payload, drain=resync):
+                pass
+            else:
+                if retry_once:
+                    _log_line(f"[0x0005] retrying packet idx={idx}")
+                    if not _send_wait_ack(f"chunk {idx + 1}/{total_packets} RETRY sz={len(chunk)}", data_payload, drain=True):
+                        _log_line(f"[0x0005] ERROR: packet idx={idx} failed after retry; aborting")
+                        return
+                else:
+                    _log_line(f"[0x0005] ERROR: packet idx={idx} failed; aborting")
+                    return
 
-        sent += len(chunk)
-        if (idx & 0x1F) == 0 or sent == total_size:
-            pct = 100.0 * sent / total_size if total_size else 100.0
-            _log_line(f"[0x0005] progress {sent}/{total_size} bytes ({pct:.1f}%)")
+            _progress(idx, len(chunk))
 
-    _log_line(f"[0x0005] Transfer of {zip_path} complete: {total_packets} packets, {total_size} bytes")
+        _log_line(f"[0x0005] Transfer of {zip_path} complete: {total_packets} packets, {total_size} bytes")
+    finally:
+        data.close()
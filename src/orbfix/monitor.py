@@ -10,10 +10,16 @@ from pathlib import Path
 
 import typer
 
-from .transport.serial_rs422 import open_serial, RiseParser, _fsm_decode_byte, RiseState
+from .transport.serial_rs422 import open_serial, _frame_end, SYNC, HEADER_R
 from .cmds.base import _encode_frame
 from .common.RISECommand import RISECommand
 from .cmds.parsers import parse_decoded
+from .cmds.loader import load_all as load_all_cmds
+
+try:
+    import orjson  # optional: faster socket replies when installed
+except ModuleNotFoundError:
+    orjson = None
 
 app = typer.Typer(help="OrbFIX monitor: keep serial open, stream NMEA, proxy commands.")
 
@@ -38,6 +44,63 @@ def _drain(ser, ms: int = 50):
         _ = ser.read(ser.in_waiting or 1)
 
 
+def _split_rx(rx: bytearray, text: bytearray, keep_frames: bool = True) -> list[bytes]:
+    """
+    Split received bytes into RISE frames (returned) and text (NMEA sentences
+    and any other ASCII, appended to `text`), jumping between '$' / 'RS' / EOL
+    boundaries with bytes.find instead of stepping the FSM per byte. An NMEA
+    line or frame still incomplete at the end stays in rx for the next call.
+    With keep_frames=False frames are skipped without being copied out.
+    """
+    frames: list[bytes] = []
+    n = len(rx)
+    pos = 0
+    # Copy out of rx through a view: one copy per slice instead of two
+    with memoryview(rx) as view:
+        while pos < n:
+            d = rx.find(b"$", pos)
+            i = rx.find(SYNC, pos)
+            if d >= 0 and (i < 0 or d < i):
+                # NMEA sentence: taken whole up to '\n', so its bytes never reach the framer
+                nl = rx.find(b"\n", d)
+                if nl < 0:
+                    text += view[pos:d]
+                    pos = d
+                    break
+                text += view[pos:nl + 1]
+                pos = nl + 1
+                continue
+            if i < 0:
+                # A trailing 'R' may be the first half of the next sync
+                end = n - 1 if rx[-1] == HEADER_R else n
+                text += view[pos:end]
+                pos = end
+                break
+
+            text += view[pos:i]
+            pos = i
+            end = _frame_end(rx, i)
+            if end > 0:
+                if keep_frames:
+                    frames.append(bytes(view[i:end]))
+                pos = end
+            elif end == 0:
+                break
+            else:
+                # Not a frame: pass the 'R' on as text and resync just after it
+                text.append(HEADER_R)
+                pos = i + 1
+    del rx[:pos]
+    return frames
+
+
+def _json_line(obj) -> bytes:
+    """Serialize a socket reply as one compact JSON line."""
+    if orjson:
+        return orjson.dumps(obj) + b"\n"
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+
+
 class _Tee:
     def __init__(self, *streams):
         self.streams = streams
@@ -45,11 +108,13 @@ class _Tee:
     def write(self, data):
         for stream in self.streams:
             stream.write(data)
-        for stream in self.streams:
-            try:
-                stream.flush()
-            except Exception:
-                pass
+        # print() writes the text and its "\n" separately: flush once per line, not per write
+        if "\n" in data:
+            for stream in self.streams:
+                try:
+                    stream.flush()
+                except Exception:
+                    pass
 
     def flush(self):
         for stream in self.streams:
@@ -67,6 +132,9 @@ def start(
 ):
     import socket as pysock
 
+    # Proxied commands may be any of them: register every response parser up front
+    load_all_cmds()
+
     log_fp = None
     if log_file:
         log_path = Path(log_file)
@@ -79,6 +147,7 @@ def start(
     stop_evt = threading.Event()
     ser_lock = threading.Lock()
     resp_evt = threading.Event()
+    resp_cv = threading.Condition()  # notified by the reader when a response frame is captured
     resp_frames: list[bytes] = []
     resp_text_lines: list[str] = []
     expected_cmd_id_box = {"val": None}
@@ -86,91 +155,67 @@ def start(
     udp_sock = None
     if udp_host:
         udp_sock = pysock.socket(pysock.AF_INET, pysock.SOCK_DGRAM)
+        # Connect once: the address is resolved here instead of on every sentence
+        try:
+            udp_sock.connect((udp_host, udp_port))
+        except OSError as e:
+            print(f"[monitor] UDP forwarding disabled: {e}", file=sys.stderr)
+            udp_sock.close()
+            udp_sock = None
 
     ser = open_serial(port, baudrate=baud, timeout_s=0.05)
     ser.reset_input_buffer()
     ser.reset_output_buffer()
 
     def reader():
-        parser = RiseParser()
-        buf = bytearray()
-        ascii_mode = False  # NEW
+        rx = bytearray()   # received bytes not yet split
+        buf = bytearray()  # text awaiting a complete line
 
         while not stop_evt.is_set():
             try:
-                chunk = ser.read(512)
+                # Drain whatever is buffered in one read; when idle, read(1) blocks in
+                # the driver for the port timeout instead of sleeping in Python
+                chunk = ser.read(ser.in_waiting or 1)
                 if not chunk:
-                    time.sleep(0.01)
                     continue
 
-                for b in chunk:
-                    # if we are inside a NMEA line, don't let the RISE FSM touch it
-                    if ascii_mode:
-                        buf.append(b)
-                        if b == 0x0A:  # '\n'
-                            ascii_mode = False
-                        continue
-
-                    # start ASCII mode on NMEA '$'
-                    if b == 0x24:  # '$'
-                        ascii_mode = True
-                        buf.append(b)
-                        continue
-
-                    # Existing FSM path for non-NMEA bytes
-                    state_before = parser.state
-                    flen = _fsm_decode_byte(parser, b)
-                    state_after = parser.state
-
-                    if flen > 0:
-                        frame = bytes(parser.buffer[:flen])
-
-                        if resp_evt.is_set():
-                            try:
-                                dec = RISECommand(frame)
-                                if expected_cmd_id_box["val"] is None or dec.cmd_id == expected_cmd_id_box["val"]:
-                                    resp_frames.append(frame)
-                            except Exception:
-                                resp_frames.append(frame)
-
-                    else:
-                        if state_after == RiseState.ST_WAIT_SYNC1:
-                            if state_before == RiseState.ST_WAIT_SYNC1 and b != 0x52:  # 'R'
-                                buf.append(b)
-                            elif state_before == RiseState.ST_WAIT_SYNC2:
-                                buf.append(0x52)
-                                buf.append(b)
-
-                # Process complete ASCII lines (unchanged)
-                while True:
-                    nl = buf.find(b"\n")
-                    if nl < 0:
-                        break
-                    line = bytes(buf[:nl+1])
-                    del buf[:nl+1]
+                rx += chunk
+                # Frames are only kept while a proxied command is waiting for its response
+                for frame in _split_rx(rx, buf, keep_frames=resp_evt.is_set()):
                     try:
-                        txt = line.decode("ascii", errors="replace").rstrip("\r\n")
+                        dec = RISECommand(frame)
+                        matched = expected_cmd_id_box["val"] is None or dec.cmd_id == expected_cmd_id_box["val"]
                     except Exception:
-                        txt = ""
-                    if not txt:
+                        matched = True
+                    if matched:
+                        with resp_cv:
+                            resp_frames.append(frame)
+                            resp_cv.notify_all()
+
+                # Process complete ASCII lines: split all of them off in one pass and
+                # classify on the raw bytes, decoding each line once
+                nl = buf.rfind(b"\n")
+                if nl < 0:
+                    continue
+                lines = buf[:nl].split(b"\n")
+                del buf[:nl + 1]
+                capturing = resp_evt.is_set()
+                for line in lines:
+                    line = line.rstrip(b"\r")
+                    if not line:
                         continue
+                    txt = line.decode("ascii", errors="replace")
 
-                    if txt.startswith("$"):
-                        print(txt)
-                        if udp_sock:
-                            try:
-                                udp_sock.sendto((txt + "\r\n").encode("ascii", errors="replace"), (udp_host, udp_port))
-                            except Exception:
-                                pass
-                    elif resp_evt.is_set():
+                    # NMEA is always forwarded; other text is a command response while capturing
+                    if capturing and not line.startswith(b"$"):
                         resp_text_lines.append(txt)
-                    else:
-                        print(txt)
-                        if udp_sock:
-                            try:
-                                udp_sock.sendto((txt + "\r\n").encode("ascii", errors="replace"), (udp_host, udp_port))
-                            except Exception:
-                                pass
+                        continue
+                    print(txt)
+                    if udp_sock:
+                        try:
+                            udp_sock.send(line + b"\r\n" if line.isascii() else (txt + "\r\n").encode("ascii", errors="replace"))
+                        except Exception:
+                            pass
 
             except Exception as e:
                 print(f"[reader] {e}", file=sys.stderr)
@@ -190,21 +235,22 @@ def start(
                     except socket.timeout:
                         continue
                     with conn:
-                        data = b""
+                        # Request is one JSON line; accumulate in place rather than re-copying per chunk
+                        data = bytearray()
                         conn.settimeout(1.0)
                         while True:
-                            chunk = conn.recv(4096)
+                            chunk = conn.recv(65536)
                             if not chunk:
                                 break
                             data += chunk
-                            if data.endswith(b"\n"):
+                            if chunk.endswith(b"\n"):
                                 break
 
                         try:
-                            req = json.loads(data.decode("utf-8"))
+                            req = json.loads(data)
                         except Exception as e:
                             resp = {"ok": False, "error": f"bad json: {e}"}
-                            conn.sendall(json.dumps(resp).encode("utf-8") + b"\n")
+                            conn.sendall(_json_line(resp))
                             continue
 
                         try:
@@ -214,9 +260,13 @@ def start(
                             payload = bytes.fromhex(payload_hex)
                             wait = float(req.get("wait", 2.0))
                             decode = bool(req.get("decode", True))
+                            # None: collect for the whole `wait`, as send_and_receive does
+                            expected_count = req.get("expected_count")
+                            if expected_count is not None:
+                                expected_count = max(1, int(expected_count))
                         except Exception as e:
                             resp = {"ok": False, "error": f"bad fields: {e}"}
-                            conn.sendall(json.dumps(resp).encode("utf-8") + b"\n")
+                            conn.sendall(_json_line(resp))
                             continue
 
                         try:
@@ -235,16 +285,20 @@ def start(
                                 ser.write(enc)
                                 ser.flush()
 
-                                # Wait for response
-                                deadline = time.monotonic() + wait
-                                while time.monotonic() < deadline and not stop_evt.is_set():
-                                    time.sleep(0.02)
+                                # Collect response frames for `wait`; return early once an
+                                # explicitly expected count has arrived, or on shutdown
+                                with resp_cv:
+                                    resp_cv.wait_for(
+                                        lambda: stop_evt.is_set()
+                                        or (expected_count is not None and len(resp_frames) >= expected_count),
+                                        timeout=wait,
+                                    )
 
                                 resp_evt.clear()
                                 expected_cmd_id_box["val"] = None
                         except Exception as e:
                             resp = {"ok": False, "error": f"serial error: {e}"}
-                            conn.sendall(json.dumps(resp).encode("utf-8") + b"\n")
+                            conn.sendall(_json_line(resp))
                             continue
 
                         frames_hex = [f.hex() for f in resp_frames]
@@ -264,7 +318,7 @@ def start(
                             "text_lines": resp_text_lines,
                             "human": "\n".join(human_lines),
                         }
-                        conn.sendall(json.dumps(resp).encode("utf-8") + b"\n")
+                        conn.sendall(_json_line(resp))
 
                 except Exception as e:
                     print(f"[server-loop] {e}", file=sys.stderr)
@@ -292,6 +346,9 @@ def start(
         pass
     finally:
         stop_evt.set()
+        # Wake a server thread still waiting for a response
+        with resp_cv:
+            resp_cv.notify_all()
         t_r.join(timeout=1.0)
         t_s.join(timeout=1.0)
         try:
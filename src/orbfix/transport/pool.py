@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import atexit
+from typing import Dict, Tuple
+
+import serial
+
+from .serial_rs422 import open_serial, DEFAULT_BAUD, DEFAULT_READ_TIMEOUT_S
+
+__all__ = ["get_serial", "discard_serial", "close_all"]
+
+# Open ports for this process, keyed by (port, baudrate)
+_POOL: Dict[Tuple[str, int], serial.Serial] = {}
+
+
+def get_serial(port: str, baudrate: int = DEFAULT_BAUD, timeout_s: float = DEFAULT_READ_TIMEOUT_S) -> serial.Serial:
+    """
+    Return an open port for (port, baudrate), opening it on first use.
+    The same Serial object is handed out to every later command in this
+    process; callers must not close it (use discard_serial() instead).
+    """
+    key = (port, baudrate)
+    ser = _POOL.get(key)
+    if ser is not None and ser.is_open:
+        if ser.timeout != timeout_s:
+            ser.timeout = timeout_s
+        return ser
+    ser = open_serial(port, baudrate=baudrate, timeout_s=timeout_s)
+    _POOL[key] = ser
+    return ser
+
+
+def discard_serial(port: str, baudrate: int = DEFAULT_BAUD) -> None:
+    """Close and forget a pooled port, e.g. after an I/O error."""
+    ser = _POOL.pop((port, baudrate), None)
+    if ser is not None:
+        try:
+            ser.close()
+        except (serial.SerialException, OSError):
+            pass
+
+
+def close_all() -> None:
+    """Close every pooled port."""
+    for key in list(_POOL):
+        discard_serial(*key)
+
+
+atexit.register(close_all)
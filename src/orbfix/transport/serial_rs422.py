@@ -3,8 +3,6 @@ from __future__ import annotations
 import struct
 import time
 from typing import List, Optional
-from enum import Enum, auto
-from dataclasses import dataclass, field
 
 import serial
 import serial.tools.list_ports
@@ -20,6 +18,9 @@ RISE_MSG_SIZE = 2048      # Maximum message size
 HEADER_R = ord('R')
 HEADER_S = ord('S')
 
+_LEN_STRUCT = struct.Struct(">H")
+_MAX_PAYLOAD_LEN = RISE_MSG_SIZE - HEADER_LEN  # longer length fields are rejected
+
 DEFAULT_BAUD = 115200
 DEFAULT_READ_TIMEOUT_S = 0.1
 
@@ -35,127 +36,54 @@ __all__ = [
     "DEFAULT_READ_TIMEOUT_S",
 ]
 
-# === FSM Parser ===
-class RiseState(Enum):
-    """FSM states for incremental RISE protocol parsing."""
-    ST_WAIT_SYNC1 = auto()
-    ST_WAIT_SYNC2 = auto()
-    ST_READ_CRC_0 = auto()
-    ST_READ_CRC_1 = auto()
-    ST_READ_SUBSYS = auto()
-    ST_READ_CMD_ID_0 = auto()
-    ST_READ_CMD_ID_1 = auto()
-    ST_READ_LEN_0 = auto()
-    ST_READ_LEN_1 = auto()
-    ST_READ_PAYLOAD = auto()
-    ST_READ_EOL = auto()
-
-@dataclass
-class RiseParser:
-    """State container for incremental RISE protocol decoder."""
-    state: RiseState = RiseState.ST_WAIT_SYNC1
-    buffer: bytearray = field(default_factory=lambda: bytearray(RISE_MSG_SIZE))
-    pos: int = 0
-    expected_length: int = 0
-
-    def reset(self):
-        """Reset parser to initial state."""
-        self.state = RiseState.ST_WAIT_SYNC1
-        self.pos = 0
-        self.expected_length = 0
-
-
-def _fsm_decode_byte(parser: RiseParser, byte: int) -> int:
-    """
-    Incrementally decode a single byte using FSM.
-    Returns frame length when complete frame is decoded, 0 otherwise.
-
-    Args:
-        parser: Parser state object
-        byte: Single byte to process (0-255)
 
-    Returns:
-        Frame length if complete, 0 if incomplete or error
+def _frame_end(buf: bytearray, i: int) -> int:
+    """
+    For the sync pair at buf[i], return the offset just past the frame it
+    starts, 0 if buf does not hold the whole frame yet, or -1 if the bytes
+    there cannot be a frame (over-long, or no EOL where the length says).
+    """
+    n = len(buf)
+    if n - i < HEADER_LEN:
+        return 0
+    length = _LEN_STRUCT.unpack_from(buf, i + LEN_OFFSET)[0]
+    if length > _MAX_PAYLOAD_LEN:
+        return -1
+    end = i + HEADER_LEN + length + 1
+    if end > n:
+        return 0
+    return end if buf[end - 1] == EOL else -1
+
+
+def _scan_frames(buf: bytearray) -> List[bytes]:
     """
-    state = parser.state
-
-    if state == RiseState.ST_WAIT_SYNC1:
-        if byte == HEADER_R:
-            parser.buffer[0] = byte
-            parser.pos = 1
-            parser.state = RiseState.ST_WAIT_SYNC2
-
-    elif state == RiseState.ST_WAIT_SYNC2:
-        if byte == HEADER_S:
-            parser.buffer[parser.pos] = byte
-            parser.pos += 1
-            parser.state = RiseState.ST_READ_CRC_0
+    Pull every complete frame out of buf in bulk: bytes.find locates the sync
+    pair and the length field says where the frame ends, so no Python code
+    runs per byte. Consumed bytes are deleted from buf; a trailing partial
+    frame is left in place for the next call.
+    """
+    frames: List[bytes] = []
+    n = len(buf)
+    pos = 0
+    while True:
+        i = buf.find(SYNC, pos)
+        if i < 0:
+            # A lone trailing 'R' may be the first half of the next sync
+            pos = n - 1 if n and buf[-1] == HEADER_R else n
+            break
+        end = _frame_end(buf, i)
+        if end > 0:
+            with memoryview(buf) as view:
+                frames.append(bytes(view[i:end]))  # one copy; buf[i:end] would add a second
+            pos = end
+        elif end == 0:
+            pos = i
+            break
         else:
-            parser.reset()
-
-    elif state == RiseState.ST_READ_CRC_0:
-        parser.buffer[parser.pos] = byte
-        parser.pos += 1
-        parser.state = RiseState.ST_READ_CRC_1
-
-    elif state == RiseState.ST_READ_CRC_1:
-        parser.buffer[parser.pos] = byte
-        parser.pos += 1
-        parser.state = RiseState.ST_READ_SUBSYS
-
-    elif state == RiseState.ST_READ_SUBSYS:
-        parser.buffer[parser.pos] = byte
-        parser.pos += 1
-        parser.state = RiseState.ST_READ_CMD_ID_0
-
-    elif state == RiseState.ST_READ_CMD_ID_0:
-        parser.buffer[parser.pos] = byte
-        parser.pos += 1
-        parser.state = RiseState.ST_READ_CMD_ID_1
-
-    elif state == RiseState.ST_READ_CMD_ID_1:
-        parser.buffer[parser.pos] = byte
-        parser.pos += 1
-        parser.state = RiseState.ST_READ_LEN_0
-
-    elif state == RiseState.ST_READ_LEN_0:
-        parser.buffer[parser.pos] = byte
-        parser.pos += 1
-        parser.state = RiseState.ST_READ_LEN_1
-        parser.expected_length = byte << 8  # Big-endian high byte
-
-    elif state == RiseState.ST_READ_LEN_1:
-        parser.buffer[parser.pos] = byte
-        parser.pos += 1
-        parser.expected_length |= byte  # Big-endian low byte
-
-        # Validate total message size
-        if HEADER_LEN + parser.expected_length > RISE_MSG_SIZE:
-            parser.reset()
-            return 0
-
-        # Skip to EOL if payload length is 0
-        parser.state = (RiseState.ST_READ_EOL if parser.expected_length == 0
-                       else RiseState.ST_READ_PAYLOAD)
-
-    elif state == RiseState.ST_READ_PAYLOAD:
-        parser.buffer[parser.pos] = byte
-        parser.pos += 1
-        if parser.pos == HEADER_LEN + parser.expected_length:
-            parser.state = RiseState.ST_READ_EOL
-
-    elif state == RiseState.ST_READ_EOL:
-        parser.buffer[parser.pos] = byte
-        parser.pos += 1
-        if byte != EOL:
-            parser.reset()
-            return 0
-        # Complete frame received
-        frame_len = parser.pos
-        parser.reset()
-        return frame_len
-
-    return 0
+            # Not a frame after all; resync just past this 'R'
+            pos = i + 1
+    del buf[:pos]
+    return frames
 
 
 # === Device discovery ===
@@ -223,7 +151,7 @@ def flush_serial(ser: serial.Serial) -> None:
         pass
 
 
-# === Frame reader (FSM-based) ===
+# === Frame reader ===
 
 def read_frames(
     ser: serial.Serial,
@@ -236,14 +164,14 @@ def read_frames(
     debug_hex: bool = False,
 ) -> List[bytes]:
     """
-    Read framed messages until deadline using FSM-based incremental parser.
-    Returns all frames collected.
+    Read framed messages until deadline, splitting each read in bulk with
+    _scan_frames(). Returns all frames collected.
 
-    Note: This function now uses FSM parsing internally. The require_eol,
-    len_offset, and len_big_endian parameters are kept for backward
-    compatibility but are not used (FSM enforces protocol structure).
+    Note: The require_eol, len_offset, and len_big_endian parameters are kept
+    for backward compatibility but are not used (the framer enforces protocol
+    structure).
     """
-    parser = RiseParser()
+    rx = bytearray()
     frames: List[bytes] = []
 
     while time.monotonic() < deadline:
@@ -259,15 +187,12 @@ def read_frames(
         if debug_hex:
             print(f"[RX] {chunk.hex(' ')}")
 
-        # Process each byte through FSM
-        for byte in chunk:
-            frame_len = _fsm_decode_byte(parser, byte)
-            if frame_len > 0:
-                # Complete frame received
-                frame = bytes(parser.buffer[:frame_len])
-                frames.append(frame)
-                if debug_hex:
-                    print(f"[FRAME] {frame.hex(' ')}")
+        # Frame the read in one pass; a partial frame waits in rx for the next read
+        rx += chunk
+        for frame in _scan_frames(rx):
+            frames.append(frame)
+            if debug_hex:
+                print(f"[FRAME] {frame.hex(' ')}")
 
     # Return all frames collected
     return frames